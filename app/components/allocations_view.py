@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from dataclasses import replace
 from datetime import date, timedelta
 
 from app.database import queries as db
@@ -194,7 +195,7 @@ def render_allocation_form():
         # Update the person_id based on selection
         for name, id in person_options:
             if name == selected_person:
-                allocation.person_id = id
+                allocation = replace(allocation, person_id=id)
                 break
         
         # Project selection
@@ -222,7 +223,7 @@ def render_allocation_form():
         selected_project_id = None
         for name, id in project_options:
             if name == selected_project:
-                allocation.project_id = id
+                allocation = replace(allocation, project_id=id)
                 selected_project_id = id
                 break
         
@@ -251,7 +252,7 @@ def render_allocation_form():
             # Update the demand_id based on selection
             for name, id in demand_options:
                 if name == selected_demand:
-                    allocation.demand_id = id
+                    allocation = replace(allocation, demand_id=id)
                     break
         
         # FTE allocation
@@ -284,10 +285,13 @@ def render_allocation_form():
                 st.error("End date must be after start date")
             else:
                 # Update allocation object
-                allocation.fte_allocated = fte_allocated
-                allocation.start_date = start_date
-                allocation.end_date = end_date
-                allocation.notes = notes
+                allocation = replace(
+                    allocation,
+                    fte_allocated=fte_allocated,
+                    start_date=start_date,
+                    end_date=end_date,
+                    notes=notes
+                )
                 
                 # Save to database
                 allocation_id = db.save_allocation(allocation)
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import pyarrow.compute as pc
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import date, datetime, timedelta
@@ -37,14 +38,15 @@ def create_project_health_chart(projects):
 
 def create_team_allocation_chart(team_allocations):
     """Create a horizontal bar chart showing team allocation breakdown."""
-    if not team_allocations:
+    if team_allocations.num_rows == 0:
         return go.Figure()
     
-    df = pd.DataFrame([{
-        "team": ta.team_name,  # TeamAllocation has team_name
-        "allocated": ta.allocation_fte,
-        "available": ta.capacity_fte - ta.allocation_fte
-    } for ta in team_allocations])
+    teams = team_allocations.to_pandas()
+    df = pd.DataFrame({
+        "team": teams["team_name"],
+        "allocated": teams["allocation_fte"],
+        "available": teams["capacity_fte"] - teams["allocation_fte"]
+    })
     
     # Sort by allocated percentage (descending)
     df["allocated_pct"] = df["allocated"] / (df["allocated"] + df["available"]) * 100
@@ -78,9 +80,15 @@ def create_team_allocation_chart(team_allocations):
     
     return fig
 
-def create_skills_analysis_chart(demands, people):
-    """Create a bar chart comparing skills demand vs. capacity."""
-    if not demands or not people:
+def create_skills_analysis_chart(demands, people_skills):
+    """
+    Create a bar chart comparing skills demand vs. capacity.
+    
+    Args:
+        demands: Demand objects
+        people_skills: Arrow list column with one list of skills per person
+    """
+    if not demands or len(people_skills) == 0:
         return go.Figure()
     
     # Safely get skills from an object (handling both string and list formats)
@@ -102,12 +110,12 @@ def create_skills_analysis_chart(demands, people):
         for skill in skills_list:
             demand_skills[skill] = demand_skills.get(skill, 0) + d.fte_required
     
-    # Aggregate skills from people
-    capacity_skills = {}
-    for p in people:
-        skills_list = get_skills(p, "skills")
-        for skill in skills_list:
-            capacity_skills[skill] = capacity_skills.get(skill, 0) + 1
+    # Count people per skill in one pass over the flattened skill lists
+    skill_counts = pc.value_counts(pc.list_flatten(people_skills))
+    capacity_skills = dict(zip(
+        skill_counts.field("values").to_pylist(),
+        skill_counts.field("counts").to_pylist()
+    ))
     
     # Combine data
     all_skills = sorted(set(list(demand_skills.keys()) + list(capacity_skills.keys())))
@@ -227,23 +235,19 @@ def aggregate_data_by_period(monthly_data, period="month"):
     result.rename(columns={group_col: "Period"}, inplace=True)
     return result
 
-def create_resource_trend_chart(monthly_data, period="month"):
+def create_resource_trend_chart(df):
     """
     Create a line chart showing capacity vs allocation vs demand over time.
     
     Args:
-        monthly_data: List of MonthlyDemandAllocation objects
-        period: Time resolution ("month", "quarter", or "year")
+        df: Per-period data from aggregate_data_by_period
         
     Returns:
         Plotly figure with the chart
     """
-    if not monthly_data:
+    if df.empty:
         return go.Figure()
     
-    # Aggregate data by selected period
-    df = aggregate_data_by_period(monthly_data, period)
-    
     fig = go.Figure()
     
     # Add traces
@@ -287,6 +291,71 @@ def create_resource_trend_chart(monthly_data, period="month"):
     
     return fig
 
+@st.fragment
+def render_resource_trends(monthly_data):
+    """
+    Render the resolution selector, trend chart and period table.
+    
+    Runs as a fragment, so switching the time resolution reruns only this
+    section. Anything the rest of the dashboard needs from it has to go
+    through st.session_state.
+    
+    Args:
+        monthly_data: List of MonthlyDemandAllocation objects
+    """
+    # Time resolution selector
+    time_resolution = st.radio(
+        "Time Resolution",
+        ["Monthly", "Quarterly", "Annual"],
+        horizontal=True,
+        key="time_resolution"
+    )
+    
+    # Map selection to period
+    period_map = {
+        "Monthly": "month",
+        "Quarterly": "quarter",
+        "Annual": "year"
+    }
+    selected_period = period_map.get(time_resolution, "month")
+    
+    # Aggregate once for both the chart and the table below
+    df_agg = aggregate_data_by_period(monthly_data, period=selected_period)
+    
+    # Create chart with selected resolution
+    fig_resource_trend = create_resource_trend_chart(df_agg)
+    st.plotly_chart(fig_resource_trend, use_container_width=True)
+    
+    refreshed_at = db.get_monthly_refreshed_at()
+    if refreshed_at:
+        st.caption(f"Monthly figures last refreshed {refreshed_at.strftime('%b %d, %Y %H:%M')}")
+    
+    # Create table of aggregated data
+    if not df_agg.empty:
+        df_display = pd.DataFrame({
+            "Period": df_agg["Period"],
+            "Demand": df_agg["demand_fte"].round(1),
+            "Allocation": df_agg["allocation_fte"].round(1),
+            "Capacity": df_agg["capacity_fte"].round(1),
+            "Utilization %": ((df_agg["allocation_fte"] / df_agg["capacity_fte"]) * 100).round(1),
+            "Gap": (df_agg["allocation_fte"] - df_agg["demand_fte"]).round(1)
+        })
+        
+        # Add status column
+        df_display["Status"] = df_display["Gap"].apply(classify_gap)
+        
+        # Display as styled dataframe
+        st.dataframe(
+            df_display.style.apply(lambda x: [
+                "background-color: #ffcdd2" if v == "critical" else
+                "background-color: #ffe0b2" if v == "deficit" else
+                "background-color: #c8e6c9" if v == "balanced" else
+                "background-color: #b3e5fc" if v == "surplus" else ""
+                for v in x
+            ], subset=["Status"]),
+            use_container_width=True
+        )
+
 def render_dashboard():
     """Render the main dashboard view."""
     st.header("Resource Management Dashboard")
@@ -296,25 +365,23 @@ def render_dashboard():
     
     # Create metrics
     col1, col2, col3, col4 = st.columns(4)
+    total_people, active_projects, open_demands = db.get_dashboard_counts()
     
     with col1:
-        total_people = db.get_total_people_count()
         st.metric("Total People", total_people)
     
     with col2:
-        active_projects = db.get_active_projects_count()
         st.metric("Active Projects", active_projects)
     
     with col3:
-        open_demands = db.get_open_demands_count()
         st.metric("Open Demands", open_demands)
     
     with col4:
         # Calculate total allocation percentage
-        team_allocations = db.get_team_allocations(start_date, end_date)
-        if team_allocations:
-            total_allocation = sum(ta.allocation_fte for ta in team_allocations)
-            total_capacity = sum(ta.capacity_fte for ta in team_allocations)
+        team_allocations = db.get_team_allocations_arrow(start_date, end_date)
+        if team_allocations.num_rows:
+            total_allocation = pc.sum(team_allocations["allocation_fte"]).as_py()
+            total_capacity = pc.sum(team_allocations["capacity_fte"]).as_py()
             allocation_percentage = round((total_allocation / total_capacity * 100) if total_capacity > 0 else 0, 1)
             st.metric("Overall Allocation", f"{allocation_percentage}%")
         else:
@@ -335,59 +402,14 @@ def render_dashboard():
     st.subheader("Resource Trends")
     monthly_data = db.get_monthly_demand_allocation(start_date, end_date)
     
-    # Time resolution selector
-    time_resolution = st.radio(
-        "Time Resolution",
-        ["Monthly", "Quarterly", "Annual"],
-        horizontal=True,
-        key="time_resolution"
-    )
-    
-    # Map selection to period
-    period_map = {
-        "Monthly": "month",
-        "Quarterly": "quarter",
-        "Annual": "year"
-    }
-    selected_period = period_map.get(time_resolution, "month")
-    
-    # Create chart with selected resolution
-    fig_resource_trend = create_resource_trend_chart(monthly_data, period=selected_period)
-    st.plotly_chart(fig_resource_trend, use_container_width=True)
-    
-    # Create table of aggregated data
-    if monthly_data:
-        df_agg = aggregate_data_by_period(monthly_data, period=selected_period)
-        if not df_agg.empty:
-            df_display = pd.DataFrame({
-                "Period": df_agg["Period"],
-                "Demand": df_agg["demand_fte"].round(1),
-                "Allocation": df_agg["allocation_fte"].round(1),
-                "Capacity": df_agg["capacity_fte"].round(1),
-                "Utilization %": ((df_agg["allocation_fte"] / df_agg["capacity_fte"]) * 100).round(1),
-                "Gap": (df_agg["allocation_fte"] - df_agg["demand_fte"]).round(1)
-            })
-            
-            # Add status column
-            df_display["Status"] = df_display["Gap"].apply(classify_gap)
-            
-            # Display as styled dataframe
-            st.dataframe(
-                df_display.style.apply(lambda x: [
-                    "background-color: #ffcdd2" if v == "critical" else
-                    "background-color: #ffe0b2" if v == "deficit" else
-                    "background-color: #c8e6c9" if v == "balanced" else
-                    "background-color: #b3e5fc" if v == "surplus" else ""
-                    for v in x
-                ], subset=["Status"]),
-                use_container_width=True
-            )
+    render_resource_trends(monthly_data)
     
     # Skills Analysis
     st.subheader("Skills Demand vs. Capacity")
     demands = db.get_demands()
-    people = db.get_people()
-    fig_skills = create_skills_analysis_chart(demands, people)
+    # Only the skills column is needed, so skip building Person objects
+    people_skills = db.get_people_arrow().column("skills")
+    fig_skills = create_skills_analysis_chart(demands, people_skills)
     st.plotly_chart(fig_skills, use_container_width=True)
     
     # Resource Utilization Trends
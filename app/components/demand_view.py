@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from dataclasses import replace
 from datetime import date, timedelta
 
 from app.database import queries as db
@@ -93,9 +94,9 @@ def render_demand_view():
                     allocations = db.get_allocations(demand_id=demand_id)
                     
                     if allocations:
-                        # Get people information
-                        people = db.get_people()
-                        person_map = {p.id: p.name for p in people}
+                        # Get people information for just these allocations
+                        people = db.get_people_by_ids(list({alloc.person_id for alloc in allocations}))
+                        person_map = {person_id: p.name for person_id, p in people.items()}
                         
                         # Convert to DataFrame for display
                         alloc_data = []
@@ -189,7 +190,7 @@ def render_demand_view():
                 # Update the project_id based on selection
                 for name, id in project_options:
                     if name == selected_project:
-                        demand.project_id = id
+                        demand = replace(demand, project_id=id)
                         break
             
             role_required = st.text_input("Role Required", value=demand.role_required or "")
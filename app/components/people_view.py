@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from dataclasses import replace
 from datetime import date
 
 from app.database import queries as db
@@ -144,22 +145,15 @@ def render_person_allocations(person):
     st.subheader(f"Allocations for {person.name}")
     
     # Get allocations for the person
-    allocations = db.get_allocations(person_id=person.id)
+    allocations = db.get_allocations_arrow(person_id=person.id)
     
-    if allocations:
-        # Convert to DataFrame for display
-        allocations_data = []
-        for allocation in allocations:
-            allocations_data.append({
-                "ID": allocation.id,
-                "Project": allocation.project_name,
-                "FTE": allocation.fte_allocated,
-                "Start Date": allocation.start_date,
-                "End Date": allocation.end_date,
-                "Notes": allocation.notes
-            })
-        
-        df = pd.DataFrame(allocations_data)
+    if allocations.num_rows:
+        # Take the display columns straight from the Arrow table
+        df = allocations.select(
+            ["id", "project_name", "fte_allocated", "start_date", "end_date", "notes"]
+        ).rename_columns(
+            ["ID", "Project", "FTE", "Start Date", "End Date", "Notes"]
+        ).to_pandas()
         st.dataframe(df, use_container_width=True, hide_index=True)
         
         # Add a button to go to Allocations tab
@@ -262,10 +256,13 @@ def render_people_form():
                 st.error("Name is required")
             else:
                 # Create or update the person object
-                person.name = name
-                person.role = role
-                person.team_id = team_id
-                person.skills = [s for s in skills if s]  # Remove empty skills
+                person = replace(
+                    person,
+                    name=name,
+                    role=role,
+                    team_id=team_id,
+                    skills=[s for s in skills if s]  # Remove empty skills
+                )
                 
                 # Save to database
                 person_id = db.save_person(person)
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from dataclasses import replace
 from datetime import date, timedelta
 
 from app.database import queries as db
@@ -69,9 +70,11 @@ def render_projects_view():
             
             with col4:
                 if st.button("Edit Project"):
-                    # Set the project ID for editing and switch to the edit tab
-                    st.session_state.edit_project_id = selected_project_id
-                    st.rerun()
+                    # Set the project ID for editing and switch to the edit tab,
+                    # skipping the rerun if this project is already being edited
+                    if st.session_state.get("edit_project_id") != selected_project_id:
+                        st.session_state.edit_project_id = selected_project_id
+                        st.rerun()
         else:
             st.info("No projects found matching the selected criteria. Please add some projects to get started.")
     
@@ -118,22 +121,15 @@ def render_project_allocations(project):
     st.subheader(f"Allocations for {project.name}")
     
     # Get allocations for the project
-    allocations = db.get_allocations(project_id=project.id)
+    allocations = db.get_allocations_arrow(project_id=project.id)
     
-    if allocations:
-        # Convert to DataFrame for display
-        allocations_data = []
-        for allocation in allocations:
-            allocations_data.append({
-                "ID": allocation.id,
-                "Person": allocation.person_name,
-                "FTE": allocation.fte_allocated,
-                "Start Date": allocation.start_date,
-                "End Date": allocation.end_date,
-                "Notes": allocation.notes
-            })
-        
-        df = pd.DataFrame(allocations_data)
+    if allocations.num_rows:
+        # Take the display columns straight from the Arrow table
+        df = allocations.select(
+            ["id", "person_name", "fte_allocated", "start_date", "end_date", "notes"]
+        ).rename_columns(
+            ["ID", "Person", "FTE", "Start Date", "End Date", "Notes"]
+        ).to_pandas()
         st.dataframe(df, use_container_width=True, hide_index=True)
     else:
         st.info(f"No allocations found for {project.name}")
@@ -188,11 +184,14 @@ def render_project_form():
                 st.error("End date must be after start date")
             else:
                 # Create or update the project object
-                project.name = name
-                project.description = description
-                project.start_date = start_date
-                project.end_date = end_date
-                project.status = status
+                project = replace(
+                    project,
+                    name=name,
+                    description=description,
+                    start_date=start_date,
+                    end_date=end_date,
+                    status=status
+                )
                 
                 # Save to database
                 project_id = db.save_project(project)
@@ -201,9 +200,9 @@ def render_project_form():
                     action = "updated" if edit_mode else "added"
                     st.success(f"Project {action} successfully")
                     
-                    # Clear the edit project ID
+                    # Clear the edit project ID before the single rerun
                     if edit_mode:
-                        st.session_state.edit_project_id = None
+                        st.session_state.pop("edit_project_id", None)
                         st.rerun()
                 else:
                     st.error("Failed to save project")
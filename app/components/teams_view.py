@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from dataclasses import replace
 
 from app.database import queries as db
 from app.models.data_models import Team
@@ -56,9 +57,11 @@ def render_teams_list():
         
         with col3:
             if st.button("Edit Team"):
-                # Set the team ID for editing and switch to the edit tab
-                st.session_state.edit_team_id = selected_team_id
-                st.rerun()
+                # Set the team ID for editing and switch to the edit tab,
+                # skipping the rerun if this team is already being edited
+                if st.session_state.get("edit_team_id") != selected_team_id:
+                    st.session_state.edit_team_id = selected_team_id
+                    st.rerun()
     else:
         st.info("No teams found. Add some teams to get started.")
 
@@ -117,8 +120,7 @@ def render_teams_form():
                 st.error("Team name is required")
             else:
                 # Create or update the team object
-                team.name = name
-                team.description = description
+                team = replace(team, name=name, description=description)
                 
                 # Save to database
                 team_id = db.save_team(team)
@@ -127,9 +129,9 @@ def render_teams_form():
                     action = "updated" if edit_mode else "added"
                     st.success(f"Team {action} successfully")
                     
-                    # Clear the edit team ID
+                    # Clear the edit team ID before the single rerun
                     if edit_mode:
-                        st.session_state.edit_team_id = None
+                        st.session_state.pop("edit_team_id", None)
                         st.rerun()
                 else:
                     st.error("Failed to save team") 
\ No newline at end of file
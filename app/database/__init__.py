@@ -0,0 +1,80 @@
+import atexit
+import contextlib
+import random
+import threading
+import time
+
+import duckdb
+
+DB_PATH = "resource_flow.duckdb"
+
+# Process-wide connection, opened on first use and shared by the app,
+# initialization and migration code
+_conn = None
+_conn_lock = threading.Lock()
+
+def get_conn():
+    """
+    Get the shared DuckDB connection, opening it on first use.
+    
+    The connection stays open for the life of the process, so callers
+    must not close it. Opening retries briefly if another process holds
+    the database lock.
+    
+    Returns:
+        DuckDB connection
+    """
+    global _conn
+    if _conn is None:
+        with _conn_lock:
+            if _conn is None:
+                _conn = _connect()
+    return _conn
+
+def _connect():
+    """Open the database file, retrying while another process has it locked."""
+    max_retries = 3
+    retry_delay = 0.1  # seconds
+    
+    for attempt in range(max_retries):
+        try:
+            return duckdb.connect(DB_PATH)
+        except duckdb.IOException as e:
+            if "Conflicting lock" not in str(e) or attempt == max_retries - 1:
+                raise
+            # Exponential back-off with jitter so competing processes
+            # don't all retry at the same moment
+            time.sleep((2 ** attempt) * retry_delay * random.uniform(0.5, 1.5))
+
+@atexit.register
+def close_conn():
+    """Close the shared connection, checkpointing the database file."""
+    global _conn
+    with _conn_lock:
+        if _conn is not None:
+            try:
+                _conn.close()
+            except duckdb.Error as e:
+                # Nothing left to retry at exit; report it rather than
+                # dumping a traceback from the atexit hook
+                print(f"Could not close {DB_PATH} cleanly: {e}")
+            _conn = None
+
+@contextlib.contextmanager
+def tx(conn):
+    """
+    Run a block in one explicit transaction on conn.
+    
+    Commits when the block finishes and rolls back if it raises, so a
+    multi-statement write is committed once.
+    
+    Args:
+        conn: Database connection or cursor
+    """
+    conn.begin()
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
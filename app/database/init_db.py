@@ -1,41 +1,52 @@
-import duckdb
 import os
-from datetime import date, datetime, timedelta
-from calendar import monthrange
+from datetime import date, datetime
+from typing import Optional
+
+from app.database import DB_PATH, get_conn, tx
 
 def initialize_database():
     """Initialize the DuckDB database with tables and sample data."""
-    db_path = "resource_flow.duckdb"
+    db_path = DB_PATH
     
     # Check if database already exists
     if os.path.exists(db_path):
         print(f"Database already exists at {db_path}")
         return
     
-    # Create a new connection
-    conn = duckdb.connect(db_path)
+    # Creates the database file on first use
+    conn = get_conn()
     
-    try:
+    # Build the schema and seed data in a single transaction so the
+    # whole load is committed once instead of once per statement
+    with tx(conn):
         # Create tables
         create_tables(conn)
         
         # Add sample data
         add_sample_data(conn)
+        advance_id_sequences(conn)
         
         # Compute monthly allocations
         compute_monthly_allocations(conn)
-        
-        print(f"Database initialized successfully at {db_path}")
     
-    finally:
-        conn.close()
+    # Fold the write-ahead log into the database file once after the bulk load
+    conn.execute("CHECKPOINT")
+    
+    print(f"Database initialized successfully at {db_path}")
+
+# Tables whose id column defaults to the next value of <table>_id_seq
+ID_SEQUENCE_TABLES = ["teams", "people", "projects", "demands", "allocations"]
 
 def create_tables(conn):
     """Create the database tables."""
+    # One id sequence per table, so inserts without an id get the next one
+    for table in ID_SEQUENCE_TABLES:
+        conn.execute(f"CREATE SEQUENCE {table}_id_seq")
+    
     # Create Teams table
     conn.execute("""
     CREATE TABLE teams (
-        id INTEGER PRIMARY KEY,
+        id INTEGER PRIMARY KEY DEFAULT nextval('teams_id_seq'),
         name VARCHAR NOT NULL,
         description VARCHAR
     )
@@ -44,7 +55,7 @@ def create_tables(conn):
     # Create People table
     conn.execute("""
     CREATE TABLE people (
-        id INTEGER PRIMARY KEY,
+        id INTEGER PRIMARY KEY DEFAULT nextval('people_id_seq'),
         name VARCHAR NOT NULL,
         role VARCHAR,
         skills VARCHAR,
@@ -56,7 +67,7 @@ def create_tables(conn):
     # Create Projects table
     conn.execute("""
     CREATE TABLE projects (
-        id INTEGER PRIMARY KEY,
+        id INTEGER PRIMARY KEY DEFAULT nextval('projects_id_seq'),
         name VARCHAR NOT NULL,
         description VARCHAR,
         start_date DATE NOT NULL,
@@ -68,7 +79,7 @@ def create_tables(conn):
     # Create Demands table
     conn.execute("""
     CREATE TABLE demands (
-        id INTEGER PRIMARY KEY,
+        id INTEGER PRIMARY KEY DEFAULT nextval('demands_id_seq'),
         project_id INTEGER NOT NULL,
         role_required VARCHAR,
         skills_required VARCHAR,
@@ -84,7 +95,7 @@ def create_tables(conn):
     # Create Allocations table
     conn.execute("""
     CREATE TABLE allocations (
-        id INTEGER PRIMARY KEY,
+        id INTEGER PRIMARY KEY DEFAULT nextval('allocations_id_seq'),
         person_id INTEGER NOT NULL,
         project_id INTEGER NOT NULL,
         demand_id INTEGER,
@@ -108,180 +119,272 @@ def create_tables(conn):
         PRIMARY KEY (year_month)
     )
     """)
+    
+    create_indexes(conn)
+    create_monthly_rollup_objects(conn)
 
-def add_sample_data(conn):
-    """Add sample data to the database."""
-    # Add Teams
-    teams = [
-        (1, "Engineering", "Software development team"),
-        (2, "Design", "UX and UI design team"),
-        (3, "Product", "Product management team"),
-        (4, "Data Science", "Data analysis and ML team")
-    ]
+def create_indexes(conn):
+    """
+    Create secondary indexes. Safe to run repeatedly, so it is also used by the migration.
+    
+    Args:
+        conn: Database connection
+    """
+    # The person/project/demand/team ID columns are all FOREIGN KEYs, for which
+    # DuckDB already maintains ART indexes, so they get no extra indexes here.
+    # Each index adds work to every insert; drop and recreate them around
+    # large bulk imports.
+    
+    # demands gets no secondary indexes: allocations references it, and DuckDB
+    # runs an UPDATE of an indexed column as a delete plus insert, which
+    # fails the foreign key check for any demand that has allocations.
+    # Its date-range and status filters are served by zonemaps and the
+    # project_id foreign key index instead.
+    
+    # Date-range index for the start_date <= ? AND end_date >= ? overlap filters
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_allocations_range ON allocations(start_date, end_date)")
+
+def create_monthly_rollup_objects(conn):
+    """
+    Create the view and bookkeeping table behind monthly_demand_allocation.
+    
+    Safe to run repeatedly, so it is also used by the migration.
+    
+    Args:
+        conn: Database connection
+    """
+    # Days a start/end date span overlaps the month starting on m
+    conn.execute("""
+    CREATE OR REPLACE MACRO days_overlap(s, e, m) AS
+        date_diff('day', GREATEST(s, m), LEAST(e, last_day(m))) + 1
+    """)
     
-    conn.executemany("""
-    INSERT INTO teams (id, name, description)
-    VALUES (?, ?, ?)
-    """, teams)
+    # Monthly demand/allocation FTE over a month spine covering all data.
+    # Each row contributes its FTE pro rata to the days it overlaps the month.
+    conn.execute("""
+    CREATE OR REPLACE VIEW v_monthly_demand_allocation AS
+    WITH bounds AS (
+        -- Independent scalar MIN/MAX per table rather than aggregating a UNION ALL
+        SELECT 
+            date_trunc('month', LEAST(
+                (SELECT MIN(start_date) FROM demands),
+                (SELECT MIN(start_date) FROM allocations)
+            )) AS min_month,
+            date_trunc('month', GREATEST(
+                (SELECT MAX(end_date) FROM demands),
+                (SELECT MAX(end_date) FROM allocations)
+            )) AS max_month
+    ),
+    months AS (
+        SELECT 
+            ym,
+            last_day(ym) AS month_end,
+            day(last_day(ym)) AS days_in_month
+        FROM (
+            SELECT CAST(unnest(generate_series(
+                CAST(min_month AS TIMESTAMP),
+                CAST(max_month AS TIMESTAMP),
+                INTERVAL 1 MONTH
+            )) AS DATE) AS ym
+            FROM bounds
+        )
+    ),
+    demand_by_month AS (
+        SELECT 
+            m.ym,
+            SUM(
+                d.fte_required * days_overlap(d.start_date, d.end_date, m.ym) / m.days_in_month
+            ) AS monthly_fte
+        FROM months m
+        JOIN demands d ON d.start_date <= m.month_end AND d.end_date >= m.ym
+        GROUP BY m.ym
+    ),
+    allocation_by_month AS (
+        SELECT 
+            m.ym,
+            SUM(
+                a.fte_allocated * days_overlap(a.start_date, a.end_date, m.ym) / m.days_in_month
+            ) AS monthly_fte
+        FROM months m
+        JOIN allocations a ON a.start_date <= m.month_end AND a.end_date >= m.ym
+        GROUP BY m.ym
+    )
+    SELECT 
+        m.ym AS year_month,
+        COALESCE(d.monthly_fte, 0) AS demand_fte,
+        COALESCE(a.monthly_fte, 0) AS allocation_fte
+    FROM months m
+    LEFT JOIN demand_by_month d ON d.ym = m.ym
+    LEFT JOIN allocation_by_month a ON a.ym = m.ym
+    """)
     
-    # Add People
-    people = [
-        (1, "John Smith", "Software Engineer", "Python,JavaScript,React", 1),
-        (2, "Jane Doe", "Senior Developer", "Java,Kubernetes,Docker", 1),
-        (3, "Bob Johnson", "UX Designer", "Figma,Sketch,UI Design", 2),
-        (4, "Alice Brown", "Product Manager", "Agile,Roadmapping,User Research", 3),
-        (5, "Charlie Davis", "Data Scientist", "Python,R,Machine Learning,SQL", 4),
-        (6, "Eva Wilson", "Backend Developer", "Java,Spring,Databases", 1),
-        (7, "Frank Miller", "Frontend Developer", "JavaScript,React,CSS,HTML", 1),
-        (8, "Grace Lee", "UI Designer", "Illustrator,Photoshop,Wireframing", 2)
-    ]
+    # Last refresh time of each derived table, for display in the UI
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS refresh_log (
+        table_name VARCHAR PRIMARY KEY,
+        refreshed_at TIMESTAMP NOT NULL
+    )
+    """)
+
+def advance_id_sequences(conn):
+    """
+    Move each freshly created id sequence past the largest id in its table.
     
-    conn.executemany("""
-    INSERT INTO people (id, name, role, skills, team_id)
-    VALUES (?, ?, ?, ?, ?)
-    """, people)
+    DuckDB can't restart a sequence, so after rows are loaded with explicit
+    ids (the seed data, or rows copied back by the migration) values are
+    drawn until the sequence has caught up.
     
-    # Add Projects
-    today = date.today()
-    projects = [
-        (1, "Website Redesign", "Redesign company website with new branding", today - timedelta(days=30), today + timedelta(days=90), "active"),
-        (2, "Mobile App Development", "Create new mobile app for customers", today - timedelta(days=15), today + timedelta(days=120), "active"),
-        (3, "Data Platform", "Build new data analytics platform", today + timedelta(days=15), today + timedelta(days=180), "planning"),
-        (4, "CRM Integration", "Integrate with new CRM system", today + timedelta(days=45), today + timedelta(days=90), "planning")
-    ]
+    Args:
+        conn: Database connection
+    """
+    for table in ID_SEQUENCE_TABLES:
+        max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+        if max_id:
+            conn.execute(f"SELECT MAX(nextval('{table}_id_seq')) FROM range(?)", [max_id])
+
+# Seed data shipped alongside this module, one CSV per table
+SEEDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seeds")
+
+def _seed_path(table):
+    """Return the seed CSV path for a table, quoted for use as a SQL string literal."""
+    path = os.path.join(SEEDS_DIR, f"{table}.csv")
+    return "'" + path.replace("'", "''") + "'"
+
+def add_sample_data(conn):
+    """
+    Add sample data to the database.
     
-    conn.executemany("""
-    INSERT INTO projects (id, name, description, start_date, end_date, status)
-    VALUES (?, ?, ?, ?, ?, ?)
-    """, projects)
+    Rows are bulk-loaded from the CSV files in SEEDS_DIR with DuckDB's CSV
+    reader. Dates are stored as day offsets from today so the sample
+    projects always sit around the current date.
+    """
+    # Teams and people map column-for-column onto their tables
+    conn.execute(f"COPY teams FROM {_seed_path('teams')} (HEADER)")
+    conn.execute(f"COPY people FROM {_seed_path('people')} (HEADER)")
     
-    # Add Demands
-    demands = [
-        (1, 1, "Frontend Developer", "React,JavaScript,HTML,CSS", 1.0, today - timedelta(days=30), today + timedelta(days=90), 3, "partially_filled"),
-        (2, 1, "UX Designer", "Figma,Sketch,User Research", 0.5, today - timedelta(days=30), today + timedelta(days=45), 2, "filled"),
-        (3, 2, "Mobile Developer", "Swift,Kotlin,React Native", 2.0, today - timedelta(days=15), today + timedelta(days=120), 4, "partially_filled"),
-        (4, 3, "Data Engineer", "Python,SQL,ETL,Spark", 1.0, today + timedelta(days=15), today + timedelta(days=180), 3, "open"),
-        (5, 3, "Machine Learning Engineer", "Python,ML,TensorFlow", 0.5, today + timedelta(days=45), today + timedelta(days=180), 2, "open"),
-        (6, 4, "Backend Developer", "Java,Spring,API Design", 1.0, today + timedelta(days=45), today + timedelta(days=90), 3, "open")
-    ]
+    # Projects, demands and allocations resolve their offsets against today
+    conn.execute(f"""
+        INSERT INTO projects (id, name, description, start_date, end_date, status)
+        SELECT id, name, description,
+               current_date + start_offset::INTEGER,
+               current_date + end_offset::INTEGER,
+               status
+        FROM read_csv({_seed_path('projects')}, header = true)
+    """)
     
-    conn.executemany("""
-    INSERT INTO demands (id, project_id, role_required, skills_required, fte_required, start_date, end_date, priority, status)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, demands)
+    conn.execute(f"""
+        INSERT INTO demands (id, project_id, role_required, skills_required, fte_required,
+                             start_date, end_date, priority, status)
+        SELECT id, project_id, role_required, skills_required, fte_required,
+               current_date + start_offset::INTEGER,
+               current_date + end_offset::INTEGER,
+               priority, status
+        FROM read_csv({_seed_path('demands')}, header = true)
+    """)
     
-    # Add Allocations
-    allocations = [
-        (1, 7, 1, 1, 0.8, today - timedelta(days=30), today + timedelta(days=90), "Frontend work for website redesign"),
-        (2, 3, 1, 2, 0.5, today - timedelta(days=30), today + timedelta(days=45), "UX design for website"),
-        (3, 6, 2, 3, 0.5, today - timedelta(days=15), today + timedelta(days=120), "Backend support for mobile app"),
-        (4, 7, 2, 3, 0.5, today - timedelta(days=15), today + timedelta(days=60), "Frontend components for mobile app")
-    ]
+    conn.execute(f"""
+        INSERT INTO allocations (id, person_id, project_id, demand_id, fte_allocated,
+                                 start_date, end_date, notes)
+        SELECT id, person_id, project_id, demand_id, fte_allocated,
+               current_date + start_offset::INTEGER,
+               current_date + end_offset::INTEGER,
+               notes
+        FROM read_csv({_seed_path('allocations')}, header = true)
+    """)
+
+# Set once the capacity_fte column has been seen; columns are never dropped,
+# so a positive result can be reused for the lifetime of the process
+_capacity_column_present = False
+
+def has_capacity_column(conn) -> bool:
+    """
+    Check whether monthly_demand_allocation has the capacity_fte column.
     
-    conn.executemany("""
-    INSERT INTO allocations (id, person_id, project_id, demand_id, fte_allocated, start_date, end_date, notes)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, allocations)
+    Args:
+        conn: Database connection
+        
+    Returns:
+        True if the column exists, False for the older schema
+    """
+    global _capacity_column_present
+    if not _capacity_column_present:
+        _capacity_column_present = conn.execute("""
+            SELECT COUNT(*) FROM pragma_table_info('monthly_demand_allocation') 
+            WHERE name = 'capacity_fte'
+        """).fetchone()[0] > 0
+    return _capacity_column_present
 
-def compute_monthly_allocations(conn=None):
+def compute_monthly_allocations(conn=None, start_date: Optional[date] = None, end_date: Optional[date] = None):
     """
     Compute monthly demand and allocation data for visualization.
     
+    With no date range the whole table is rebuilt from v_monthly_demand_allocation.
+    With a range, only the months overlapping it are deleted and re-aggregated,
+    which is enough after a write that touched rows within that range.
+    
+    Runs inside the caller's transaction when a connection is passed in;
+    otherwise the delete and re-insert are committed together on a cursor of the shared connection.
+    
     Args:
-        conn: Optional database connection. If not provided, a new connection will be created.
+        conn: Optional database connection. If not provided, the shared connection is used.
+        start_date: Optional start of the range of months to refresh
+        end_date: Optional end of the range of months to refresh
     """
-    should_close_conn = False
-    if conn is None:
-        conn = duckdb.connect("resource_flow.duckdb")
-        should_close_conn = True
+    owns_transaction = conn is None
+    if owns_transaction:
+        conn = get_conn().cursor()
+        conn.begin()
     
     try:
-        # Clear the existing data
-        conn.execute("DELETE FROM monthly_demand_allocation")
-        
-        # Get the date range for all demands and allocations
-        date_range = conn.execute("""
-            SELECT 
-                MIN(start_date) as min_date,
-                MAX(end_date) as max_date
-            FROM (
-                SELECT start_date, end_date FROM demands
-                UNION ALL
-                SELECT start_date, end_date FROM allocations
-            )
-        """).fetchone()
+        # Restrict the refresh to the affected months if a range was given
+        if start_date is not None and end_date is not None:
+            month_filter = " WHERE year_month >= date_trunc('month', ?::DATE) AND year_month <= ?"
+            range_params = [start_date, end_date]
+        else:
+            month_filter = ""
+            range_params = []
         
-        if not date_range[0] or not date_range[1]:
-            return
-        
-        start_date = date_range[0]
-        end_date = date_range[1]
-        
-        # Generate a series of months
-        current_date = date(start_date.year, start_date.month, 1)
-        end_month = date(end_date.year, end_date.month, 1)
-        
-        # Get people count for capacity calculation
-        people_count = conn.execute("SELECT COUNT(*) FROM people").fetchone()[0]
+        # Clear the existing data
+        conn.execute("DELETE FROM monthly_demand_allocation" + month_filter, range_params)
         
-        while current_date <= end_month:
-            # Calculate days in the month
-            _, days_in_month = monthrange(current_date.year, current_date.month)
-            month_end = date(current_date.year, current_date.month, days_in_month)
+        if has_capacity_column(conn):
+            # Capacity is the people count, evaluated once for the whole insert
+            conn.execute("""
+                INSERT INTO monthly_demand_allocation 
+                (year_month, demand_fte, allocation_fte, capacity_fte)
+                SELECT year_month, demand_fte, allocation_fte,
+                       (SELECT COUNT(*) FROM people)
+                FROM v_monthly_demand_allocation
+            """ + month_filter, range_params)
             
-            # Calculate demand FTE for the month
-            demand_fte = conn.execute("""
-                SELECT COALESCE(SUM(
-                    fte_required * (
-                        CAST(
-                            (LEAST(end_date, ?) - GREATEST(start_date, ?))
-                            AS INTEGER) + 1
-                    ) / CAST(? AS INTEGER)
-                ), 0) as monthly_fte
-                FROM demands
-                WHERE start_date <= ? AND end_date >= ?
-            """, [month_end, current_date, days_in_month, month_end, current_date]).fetchone()[0]
-            
-            # Calculate allocation FTE for the month
-            allocation_fte = conn.execute("""
-                SELECT COALESCE(SUM(
-                    fte_allocated * (
-                        CAST(
-                            (LEAST(end_date, ?) - GREATEST(start_date, ?))
-                            AS INTEGER) + 1
-                    ) / CAST(? AS INTEGER)
-                ), 0) as monthly_fte
-                FROM allocations
-                WHERE start_date <= ? AND end_date >= ?
-            """, [month_end, current_date, days_in_month, month_end, current_date]).fetchone()[0]
-            
-            # Check if capacity_fte column exists in the table
-            has_capacity = conn.execute("""
-                SELECT COUNT(*) FROM pragma_table_info('monthly_demand_allocation') 
-                WHERE name = 'capacity_fte'
-            """).fetchone()[0]
-            
-            if has_capacity:
-                # Insert with capacity_fte
-                conn.execute("""
-                    INSERT INTO monthly_demand_allocation 
-                    (year_month, demand_fte, allocation_fte, capacity_fte)
-                    VALUES (?, ?, ?, ?)
-                """, [current_date, demand_fte, allocation_fte, people_count])
-            else:
-                # Insert without capacity_fte (older schema)
+            # Person writes don't mark months dirty, so bring every month
+            # outside the refreshed range up to the same head count
+            if month_filter:
                 conn.execute("""
-                    INSERT INTO monthly_demand_allocation 
-                    (year_month, demand_fte, allocation_fte)
-                    VALUES (?, ?, ?)
-                """, [current_date, demand_fte, allocation_fte])
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = date(current_date.year + 1, 1, 1)
-            else:
-                current_date = date(current_date.year, current_date.month + 1, 1)
-    
+                    UPDATE monthly_demand_allocation
+                    SET capacity_fte = (SELECT COUNT(*) FROM people)
+                    WHERE capacity_fte IS DISTINCT FROM (SELECT COUNT(*) FROM people)
+                """)
+        else:
+            # Older schema without capacity_fte
+            conn.execute("""
+                INSERT INTO monthly_demand_allocation 
+                (year_month, demand_fte, allocation_fte)
+                SELECT year_month, demand_fte, allocation_fte
+                FROM v_monthly_demand_allocation
+            """ + month_filter, range_params)
+        
+        conn.execute("""
+            INSERT OR REPLACE INTO refresh_log (table_name, refreshed_at)
+            VALUES ('monthly_demand_allocation', current_timestamp)
+        """)
+        
+        if owns_transaction:
+            conn.commit()
+    except Exception:
+        if owns_transaction:
+            conn.rollback()
+        raise
     finally:
-        if should_close_conn:
-            conn.close() 
\ No newline at end of file
+        if owns_transaction:
+            conn.close()
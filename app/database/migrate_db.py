@@ -1,59 +1,115 @@
-import duckdb
 import os
-from datetime import date
+
+from app.database import DB_PATH, get_conn, tx
+
+# Tables rebuilt by rebuild_tables, each listed after the tables it references
+REBUILT_TABLES = ["teams", "people", "projects", "demands", "allocations"]
+
+def needs_rebuild(conn) -> bool:
+    """
+    Check whether the core tables predate the id sequence defaults.
+    
+    Args:
+        conn: Database connection
+        
+    Returns:
+        True if any id column lacks its sequence default
+    """
+    missing_defaults = conn.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_name IN (SELECT UNNEST(?)) AND column_name = 'id'
+          AND column_default IS NULL
+    """, [REBUILT_TABLES]).fetchone()[0]
+    return missing_defaults > 0
+
+def rebuild_tables(conn):
+    """
+    Recreate the core tables with the current schema, keeping their rows.
+    
+    DuckDB can't alter a column of a table that other tables reference by
+    foreign key, so the rows are copied out to temporary tables, the tables
+    are dropped and recreated by create_tables with their id sequences,
+    and the rows are copied back. Everything runs in one transaction, so a
+    failure leaves the database as it was.
+    
+    Args:
+        conn: Database connection
+    """
+    from app.database.init_db import advance_id_sequences, create_tables, compute_monthly_allocations
+    
+    with tx(conn):
+        columns = {
+            table: [row[0] for row in conn.execute("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = ?
+                ORDER BY ordinal_position
+            """, [table]).fetchall()]
+            for table in REBUILT_TABLES
+        }
+        
+        for table in REBUILT_TABLES:
+            conn.execute(f"CREATE TEMP TABLE _old_{table} AS SELECT * FROM {table}")
+        
+        # Drop referencing tables before the tables they reference
+        conn.execute("DROP TABLE monthly_demand_allocation")
+        for table in reversed(REBUILT_TABLES):
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"DROP SEQUENCE IF EXISTS {table}_id_seq")
+        
+        create_tables(conn)
+        
+        for table in REBUILT_TABLES:
+            column_list = ", ".join(columns[table])
+            conn.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM _old_{table}")
+            conn.execute(f"DROP TABLE _old_{table}")
+        
+        advance_id_sequences(conn)
+        compute_monthly_allocations(conn)
 
 def migrate_database():
     """Migrate the database to the latest schema."""
-    db_path = "resource_flow.duckdb"
+    db_path = DB_PATH
     
     if not os.path.exists(db_path):
         print(f"Database not found at {db_path}")
         return
     
-    # Connect to the database
-    conn = duckdb.connect(db_path)
-    
-    try:
-        # Check if the capacity_fte column exists in monthly_demand_allocation
-        has_capacity = conn.execute("""
-            SELECT COUNT(*) FROM pragma_table_info('monthly_demand_allocation') 
-            WHERE name = 'capacity_fte'
-        """).fetchone()[0]
-        
-        if not has_capacity:
-            print("Migrating monthly_demand_allocation table to add capacity_fte column...")
-            
-            # Create a backup of the current data
-            conn.execute("""
-                CREATE TEMP TABLE monthly_demand_allocation_backup AS
-                SELECT * FROM monthly_demand_allocation
-            """)
-            
-            # Add the capacity_fte column to the table
-            conn.execute("""
-                ALTER TABLE monthly_demand_allocation ADD COLUMN capacity_fte FLOAT DEFAULT 0
-            """)
-            
-            # Update capacity values (set to people count for simplicity)
-            people_count = conn.execute("SELECT COUNT(*) FROM people").fetchone()[0]
-            conn.execute(f"""
-                UPDATE monthly_demand_allocation
-                SET capacity_fte = {people_count}
-            """)
-            
-            print(f"Added capacity_fte column with default value {people_count}")
-            
-            # Recompute monthly allocations
-            print("Recomputing monthly allocations...")
-            from app.database.init_db import compute_monthly_allocations
-            compute_monthly_allocations(conn)
-            
-            print("Migration completed successfully!")
-        else:
-            print("Database schema is already up to date.")
-    
-    finally:
-        conn.close()
+    conn = get_conn()
+    
+    rebuilt = needs_rebuild(conn)
+    if rebuilt:
+        print("Rebuilding tables with the current schema...")
+        rebuild_tables(conn)
+        print("Tables rebuilt successfully!")
+    
+    # Make sure indexes, the monthly rollup view and refresh log exist
+    from app.database.init_db import create_indexes, create_monthly_rollup_objects
+    create_indexes(conn)
+    create_monthly_rollup_objects(conn)
+    
+    # Check if the capacity_fte column exists in monthly_demand_allocation
+    has_capacity = conn.execute("""
+        SELECT COUNT(*) FROM pragma_table_info('monthly_demand_allocation') 
+        WHERE name = 'capacity_fte'
+    """).fetchone()[0]
+    
+    if not has_capacity:
+        print("Migrating monthly_demand_allocation table to add capacity_fte column...")
+        
+        # Add the capacity_fte column to the table; the recompute below
+        # rewrites every row, so no backup or interim UPDATE is needed
+        conn.execute("""
+            ALTER TABLE monthly_demand_allocation ADD COLUMN capacity_fte FLOAT DEFAULT 0
+        """)
+        
+        # Recompute monthly allocations
+        print("Recomputing monthly allocations...")
+        from app.database.init_db import compute_monthly_allocations
+        compute_monthly_allocations(conn)
+        
+        print("Migration completed successfully!")
+    elif not rebuilt:
+        print("Database schema is already up to date.")
 
 if __name__ == "__main__":
     migrate_database() 
\ No newline at end of file
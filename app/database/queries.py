@@ -1,11 +1,14 @@
-import duckdb
 import os
-import time
+import pyarrow as pa
+import queue
+import threading
 from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from functools import wraps
 import contextlib
+import functools
 
+from app.database import get_conn, tx
 from app.models.data_models import (
     Person,
     Team,
@@ -16,142 +19,344 @@ from app.models.data_models import (
     TeamAllocation
 )
 
+# Serializes writers on the shared database; reentrant so write helpers
+# can call other write helpers
+_write_lock = threading.RLock()
+
+# Number of reader cursors kept open for reuse
+POOL_SIZE = int(os.environ.get("POOL_SIZE", "4"))
+
+# Idle reader cursors; filled lazily up to POOL_SIZE
+_read_pool: "queue.Queue" = queue.Queue()
+_read_pool_created = 0
+_read_pool_lock = threading.Lock()
+
+def _acquire_read_cursor():
+    """Take an idle reader cursor, opening one if the pool isn't full yet."""
+    global _read_pool_created
+    try:
+        return _read_pool.get_nowait()
+    except queue.Empty:
+        pass
+    
+    with _read_pool_lock:
+        if _read_pool_created < POOL_SIZE:
+            _read_pool_created += 1
+            return get_conn().cursor()
+    
+    # Pool is at capacity; wait for a reader to finish
+    return _read_pool.get()
+
 @contextlib.contextmanager
 def get_db_connection(read_only: bool = False):
     """
     Get a connection to the DuckDB database.
     
+    Yields a cursor on the process-wide connection from app.database.get_conn.
+    Cursors are cheap, share the database instance and its buffer cache, and
+    can run statements concurrently from different threads.
+    
+    Readers borrow one of up to POOL_SIZE pooled cursors, so concurrent
+    dashboard panels query in parallel. Writers get their own cursor and
+    hold a process-wide lock for the duration, as DuckDB allows one writer
+    at a time without transaction conflicts.
+    
     Args:
-        read_only: Whether to open the connection in read-only mode
+        read_only: Whether the caller only reads
         
     Returns:
-        DuckDB connection
+        DuckDB cursor
     """
-    db_path = "resource_flow.duckdb"
-    max_retries = 3
-    retry_delay = 0.1  # seconds
-    conn = None
-    
-    for attempt in range(max_retries):
+    if read_only:
+        cursor = _acquire_read_cursor()
         try:
-            conn = duckdb.connect(db_path, read_only=read_only)
-            break
-        except duckdb.IOException as e:
-            if "Conflicting lock" in str(e) and attempt < max_retries - 1:
-                if conn:
-                    try:
-                        conn.close()
-                    except:
-                        pass
-                time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
-                continue
-            raise
-    
-    if not conn:
-        raise duckdb.IOException("Failed to establish database connection after retries")
-        
-    try:
-        yield conn
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except:
-                pass
+            yield cursor
+        finally:
+            _read_pool.put(cursor)
+    else:
+        cursor = get_conn().cursor()
+        try:
+            with _write_lock:
+                yield cursor
+        finally:
+            cursor.close()
 
 def with_connection(read_only: bool = False):
     """
     Decorator to handle database connections.
     
+    Write functions (read_only=False) also invalidate the cached reads
+    once they finish, so the next read sees the new data.
+    
     Args:
         read_only: Whether to open the connection in read-only mode
     """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            with get_db_connection(read_only=read_only) as conn:
-                return func(conn, *args, **kwargs)
+            try:
+                with get_db_connection(read_only=read_only) as conn:
+                    return func(conn, *args, **kwargs)
+            finally:
+                if not read_only:
+                    _invalidate_cached_reads()
+        return wrapper
+    return decorator
+
+# By-id getters memoized with _memoized_lookup, cleared on every write
+_memoized_lookups = []
+
+def _memoized_lookup(func):
+    """
+    Memoize a by-id getter in an LRU cache.
+    
+    Callers share the cached object. The models are frozen and the views
+    save changes through dataclasses.replace, so no copy is needed.
+    """
+    cached = functools.lru_cache(maxsize=1024)(func)
+    _memoized_lookups.append(cached)
+    return cached
+
+def _clear_lookup_caches() -> None:
+    """Drop every memoized by-id lookup."""
+    for lookup in _memoized_lookups:
+        lookup.cache_clear()
+
+# Incremented after every write; caches keyed on it go stale automatically
+_write_generation = 0
+
+def _invalidate_cached_reads() -> None:
+    """Bump the write generation and drop the memoized by-id lookups."""
+    global _write_generation
+    _write_generation += 1
+    _clear_lookup_caches()
+
+def _cached_read(maxsize: int = 128):
+    """
+    Cache a list reader's results per write generation.
+    
+    The generation is read before the query runs, so a read racing a write
+    can only ever be cached under the generation that preceded it. Callers
+    share the cached result: Arrow tables are immutable, the models are
+    frozen, and no caller modifies the lists it gets back.
+    
+    Args:
+        maxsize: Number of argument/generation combinations to keep
+    """
+    def decorator(func):
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(write_generation, *args, **kwargs):
+            return func(*args, **kwargs)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return cached(_write_generation, *args, **kwargs)
+        
+        wrapper.cache_clear = cached.cache_clear
         return wrapper
     return decorator
 
+def fetch_arrow(conn, query: str, params: Optional[List[Any]] = None) -> pa.Table:
+    """
+    Run a query and return the result as an Arrow table.
+    
+    DuckDB exports the result columnar, so dates stay typed and no Python
+    row tuples are built. Use this directly for plotting/UI code.
+    
+    Args:
+        conn: Database connection
+        query: SQL query
+        params: Optional query parameters
+        
+    Returns:
+        pyarrow Table with the query result
+    """
+    return conn.execute(query, params or []).arrow()
+
+def fetch_models(conn, query: str, params: Optional[List[Any]], cls) -> list:
+    """
+    Run a query and build one model object per result row.
+    
+    The query's column aliases must match the model's field names.
+    
+    Args:
+        conn: Database connection
+        query: SQL query
+        params: Optional query parameters
+        cls: Model dataclass to construct
+        
+    Returns:
+        List of model objects
+    """
+    return [cls(**row) for row in fetch_arrow(conn, query, params).to_pylist()]
+
+def skill_list_sql(column: str) -> str:
+    """
+    SQL expression reading a comma-separated skills column as a VARCHAR[] list.
+    
+    Skills are stored as VARCHAR rather than VARCHAR[]: DuckDB runs an UPDATE
+    of a list column as a delete plus insert, which fails the foreign key
+    check for people and demands that allocations reference. Splitting in
+    SQL still hands Python ready-made lists.
+    
+    Args:
+        column: Qualified name of the skills column
+        
+    Returns:
+        SQL expression, with an empty list for NULL or empty values
+    """
+    return f"COALESCE(string_split(NULLIF({column}, ''), ','), CAST([] AS VARCHAR[]))"
+
+def insert_rows(conn, table: str, columns: List[str], rows: List[tuple]) -> List[int]:
+    """
+    Insert many rows with one INSERT ... SELECT over an Arrow table.
+    
+    Args:
+        conn: Database connection
+        table: Name of the target table
+        columns: Column names, in the same order as the values in each row
+        rows: List of row tuples
+        
+    Returns:
+        IDs of the inserted rows
+    """
+    if not rows:
+        return []
+    
+    arrow_table = pa.table({column: list(values) for column, values in zip(columns, zip(*rows))})
+    conn.register("_bulk_rows", arrow_table)
+    try:
+        column_list = ", ".join(columns)
+        result = conn.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM _bulk_rows RETURNING id"
+        ).fetchall()
+    finally:
+        conn.unregister("_bulk_rows")
+    
+    return [row[0] for row in result]
+
 # People queries
+@_cached_read()
 @with_connection(read_only=True)
-def get_people(conn, team_id: Optional[int] = None) -> List[Person]:
+def get_people_arrow(conn, team_id: Optional[int] = None, skill: Optional[str] = None) -> pa.Table:
     """
-    Get all people, optionally filtered by team_id.
+    Get all people as an Arrow table, optionally filtered by team_id and skill.
+    
+    For callers that aggregate or plot columns and don't need Person objects.
     
     Args:
         team_id: Optional team ID to filter by
+        skill: Optional skill the person must have
         
     Returns:
-        List of Person objects
+        pyarrow Table with the Person fields as columns
     """
-    query = """
+    query = f"""
         SELECT 
             p.id, 
             p.name, 
             p.role, 
-            p.skills, 
+            {skill_list_sql("p.skills")} AS skills, 
             p.team_id,
             t.name as team_name
         FROM people p
         LEFT JOIN teams t ON p.team_id = t.id
     """
     
+    conditions = []
     params = []
+    
     if team_id is not None:
-        query += " WHERE p.team_id = ?"
+        conditions.append("p.team_id = ?")
         params.append(team_id)
     
-    query += " ORDER BY p.name"
+    if skill:
+        conditions.append(f"list_contains({skill_list_sql('p.skills')}, ?)")
+        params.append(skill)
     
-    result = conn.execute(query, params).fetchall()
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    
+    query += " ORDER BY p.name"
     
-    people = []
-    for row in result:
-        people.append(Person(
-            id=row[0],
-            name=row[1],
-            role=row[2],
-            skills=row[3].split(",") if row[3] else [],
-            team_id=row[4],
-            team_name=row[5]
-        ))
+    return fetch_arrow(conn, query, params)
+
+def get_people(team_id: Optional[int] = None, skill: Optional[str] = None) -> List[Person]:
+    """
+    Get all people, optionally filtered by team_id and skill.
     
-    return people
+    Args:
+        team_id: Optional team ID to filter by
+        skill: Optional skill the person must have
+        
+    Returns:
+        List of Person objects
+    """
+    return [Person(**row) for row in get_people_arrow(team_id, skill).to_pylist()]
 
 @with_connection(read_only=True)
-def get_person(conn, person_id: int) -> Optional[Person]:
+def get_people_by_ids(conn, person_ids: List[int]) -> Dict[int, Person]:
     """
-    Get a person by ID.
+    Get several people in one query.
     
     Args:
-        person_id: The ID of the person to retrieve
+        person_ids: The IDs of the people to retrieve
         
     Returns:
-        Person object if found, None otherwise
+        Dict mapping person ID to Person object; missing IDs are left out
     """
-    query = """
+    if not person_ids:
+        return {}
+    
+    query = f"""
         SELECT 
             p.id, 
             p.name, 
             p.role, 
-            p.skills, 
+            {skill_list_sql("p.skills")} AS skills, 
             p.team_id,
             t.name as team_name
         FROM people p
         LEFT JOIN teams t ON p.team_id = t.id
-        WHERE p.id = ?
+        WHERE p.id IN (SELECT UNNEST(?))
     """
     
-    result = conn.execute(query, [person_id]).fetchone()
+    people = fetch_models(conn, query, [list(person_ids)], Person)
+    return {person.id: person for person in people}
+
+PERSON_BY_ID_SQL = f"""
+    SELECT 
+        p.id, 
+        p.name, 
+        p.role, 
+        {skill_list_sql("p.skills")}, 
+        p.team_id,
+        t.name as team_name
+    FROM people p
+    LEFT JOIN teams t ON p.team_id = t.id
+    WHERE p.id = ?
+"""
+
+@_memoized_lookup
+@with_connection(read_only=True)
+def get_person(conn, person_id: int) -> Optional[Person]:
+    """
+    Get a person by ID.
+    
+    Args:
+        person_id: The ID of the person to retrieve
+        
+    Returns:
+        Person object if found, None otherwise
+    """
+    result = conn.execute(PERSON_BY_ID_SQL, [person_id]).fetchone()
     
     if result:
         return Person(
             id=result[0],
             name=result[1],
             role=result[2],
-            skills=result[3].split(",") if result[3] else [],
+            skills=result[3],
             team_id=result[4],
             team_name=result[5]
         )
@@ -172,25 +377,23 @@ def save_person(conn, person: Person) -> int:
     skills_str = ",".join(person.skills) if person.skills else ""
     
     if person.id:
-        # Check if person has allocations before updating team
-        current_person = get_person(person.id)
-        if current_person and current_person.team_id != person.team_id:
-            has_allocations = conn.execute(
-                "SELECT COUNT(*) FROM allocations WHERE person_id = ?", 
-                [person.id]
-            ).fetchone()[0]
-            
-            if has_allocations > 0:
-                # Keep the existing team_id if person has allocations
-                person.team_id = current_person.team_id
-        
         # Update existing person
         query = """
             UPDATE people
-            SET name = ?, role = ?, skills = ?, team_id = ?
+            SET name = ?, role = ?, skills = ?
             WHERE id = ?
         """
-        conn.execute(query, [person.name, person.role, skills_str, person.team_id, person.id])
+        conn.execute(query, [person.name, person.role, skills_str, person.id])
+        
+        # A person with allocations keeps their existing team. team_id is
+        # set on its own, and only when it changes: DuckDB runs an UPDATE of
+        # the indexed column as a delete plus insert, which a referenced
+        # row fails
+        conn.execute("""
+            UPDATE people SET team_id = ?
+            WHERE id = ? AND team_id IS DISTINCT FROM ?
+              AND NOT EXISTS (SELECT 1 FROM allocations WHERE person_id = ?)
+        """, [person.team_id, person.id, person.team_id, person.id])
         person_id = person.id
     else:
         # Insert new person
@@ -204,7 +407,25 @@ def save_person(conn, person: Person) -> int:
     
     return person_id
 
-def delete_person(person_id: int) -> bool:
+@with_connection()
+def save_people_bulk(conn, people: List[Person]) -> List[int]:
+    """
+    Insert many new people in one statement.
+    
+    Args:
+        people: The Person objects to insert
+        
+    Returns:
+        The IDs of the inserted people, in order
+    """
+    rows = [
+        (person.name, person.role, ",".join(person.skills) if person.skills else "", person.team_id)
+        for person in people
+    ]
+    return insert_rows(conn, "people", ["name", "role", "skills", "team_id"], rows)
+
+@with_connection()
+def delete_person(conn, person_id: int) -> bool:
     """
     Delete a person from the database.
     
@@ -214,30 +435,44 @@ def delete_person(person_id: int) -> bool:
     Returns:
         True if the person was deleted, False otherwise
     """
-    conn = get_db_connection()
+    # Delete the person only if they have no allocations, in one statement
+    deleted = conn.execute("""
+        DELETE FROM people
+        WHERE id = ?
+          AND NOT EXISTS (SELECT 1 FROM allocations WHERE person_id = ?)
+        RETURNING id
+    """, [person_id, person_id]).fetchone()
     
-    # Check if person has allocations
-    has_allocations = conn.execute(
-        "SELECT COUNT(*) FROM allocations WHERE person_id = ?", 
-        [person_id]
-    ).fetchone()[0]
+    return deleted is not None
+
+@functools.lru_cache(maxsize=1)
+@with_connection(read_only=True)
+def _get_dashboard_counts(conn, write_generation: int) -> Tuple[int, int, int]:
+    """Run the combined count query; cached per write generation."""
+    return conn.execute("""
+        SELECT 
+            (SELECT COUNT(*) FROM people),
+            (SELECT COUNT(*) FROM projects WHERE status IN ('active', 'planning')),
+            (SELECT COUNT(*) FROM demands WHERE status IN ('open', 'partially_filled'))
+    """).fetchone()
+
+def get_dashboard_counts() -> Tuple[int, int, int]:
+    """
+    Get the dashboard header counts in one query.
     
-    if has_allocations > 0:
-        conn.close()
-        return False
+    The result is reused until the next write.
     
-    # Delete person
-    conn.execute("DELETE FROM people WHERE id = ?", [person_id])
-    conn.close()
-    return True
+    Returns:
+        Tuple of (total people, active projects, open demands)
+    """
+    return _get_dashboard_counts(_write_generation)
 
-@with_connection(read_only=True)
-def get_total_people_count(conn) -> int:
+def get_total_people_count() -> int:
     """Get the total number of people in the database."""
-    count = conn.execute("SELECT COUNT(*) FROM people").fetchone()[0]
-    return count
+    return get_dashboard_counts()[0]
 
 # Teams queries
+@_cached_read()
 @with_connection(read_only=True)
 def get_teams(conn) -> List[Team]:
     """Get all teams."""
@@ -247,28 +482,19 @@ def get_teams(conn) -> List[Team]:
         ORDER BY name
     """
     
-    result = conn.execute(query).fetchall()
-    
-    teams = []
-    for row in result:
-        teams.append(Team(
-            id=row[0],
-            name=row[1],
-            description=row[2]
-        ))
-    
-    return teams
+    return fetch_models(conn, query, None, Team)
+
+TEAM_BY_ID_SQL = """
+    SELECT id, name, description
+    FROM teams
+    WHERE id = ?
+"""
 
+@_memoized_lookup
 @with_connection(read_only=True)
 def get_team(conn, team_id: int) -> Optional[Team]:
     """Get a team by ID."""
-    query = """
-        SELECT id, name, description
-        FROM teams
-        WHERE id = ?
-    """
-    
-    result = conn.execute(query, [team_id]).fetchone()
+    result = conn.execute(TEAM_BY_ID_SQL, [team_id]).fetchone()
     
     if result:
         return Team(
@@ -308,66 +534,48 @@ def delete_team(conn, team_id: int) -> bool:
     """Delete a team from the database."""
     # Check if team has members
     has_members = conn.execute(
-        "SELECT COUNT(*) FROM people WHERE team_id = ?", 
+        "SELECT EXISTS (SELECT 1 FROM people WHERE team_id = ?)", 
         [team_id]
     ).fetchone()[0]
     
-    if has_members > 0:
+    if has_members:
         return False
     
     # Delete team
     conn.execute("DELETE FROM teams WHERE id = ?", [team_id])
     return True
 
+@_cached_read()
 @with_connection(read_only=True)
-def get_team_allocations(conn, start_date: date, end_date: date) -> List[TeamAllocation]:
-    """Get team allocations for the specified date range."""
+def get_team_allocations_arrow(conn, start_date: date, end_date: date) -> pa.Table:
+    """Get team allocations for the specified date range as an Arrow table."""
+    # One pass over teams/people/allocations: capacity counts each person once,
+    # allocation sums only the allocations overlapping the range
     query = """
-    WITH team_capacity AS (
-        SELECT 
-            t.id AS team_id,
-            t.name AS team_name,
-            COUNT(p.id) AS num_people,
-            COUNT(p.id) AS capacity_fte
-        FROM teams t
-        LEFT JOIN people p ON t.id = p.team_id
-        GROUP BY t.id, t.name
-    ),
-    team_allocation AS (
-        SELECT 
-            t.id AS team_id,
-            t.name AS team_name,
-            SUM(a.fte_allocated) AS allocation_fte
-        FROM teams t
-        JOIN people p ON t.id = p.team_id
-        JOIN allocations a ON p.id = a.person_id
-        WHERE a.start_date <= ? AND a.end_date >= ?
-        GROUP BY t.id, t.name
-    )
     SELECT 
-        tc.team_id,
-        tc.team_name,
-        COALESCE(ta.allocation_fte, 0) AS allocation_fte,
-        tc.capacity_fte
-    FROM team_capacity tc
-    LEFT JOIN team_allocation ta ON tc.team_id = ta.team_id
-    ORDER BY tc.team_name
+        t.id AS team_id,
+        t.name AS team_name,
+        COALESCE(
+            SUM(a.fte_allocated) FILTER (WHERE a.start_date <= ? AND a.end_date >= ?),
+            0
+        ) AS allocation_fte,
+        COUNT(DISTINCT p.id) AS capacity_fte
+    FROM teams t
+    LEFT JOIN people p ON t.id = p.team_id
+    LEFT JOIN allocations a ON p.id = a.person_id
+    GROUP BY t.id, t.name
+    ORDER BY t.name
     """
     
-    result = conn.execute(query, [end_date, start_date]).fetchall()
-    
-    team_allocations = []
-    for row in result:
-        team_allocations.append(TeamAllocation(
-            team_id=row[0],
-            team_name=row[1],
-            allocation_fte=row[2],
-            capacity_fte=row[3]
-        ))
-    
-    return team_allocations
+    return fetch_arrow(conn, query, [end_date, start_date])
+
+def get_team_allocations(start_date: date, end_date: date) -> List[TeamAllocation]:
+    """Get team allocations for the specified date range."""
+    table = get_team_allocations_arrow(start_date, end_date)
+    return [TeamAllocation(**row) for row in table.to_pylist()]
 
 # Projects queries
+@_cached_read()
 @with_connection(read_only=True)
 def get_projects(conn, status: Optional[str] = None) -> List[Project]:
     """Get all projects, optionally filtered by status."""
@@ -383,21 +591,38 @@ def get_projects(conn, status: Optional[str] = None) -> List[Project]:
     
     query += " ORDER BY start_date DESC"
     
-    result = conn.execute(query, params).fetchall()
+    return fetch_models(conn, query, params, Project)
+
+@with_connection(read_only=True)
+def get_projects_by_ids(conn, project_ids: List[int]) -> Dict[int, Project]:
+    """
+    Get several projects in one query.
     
-    projects = []
-    for row in result:
-        projects.append(Project(
-            id=row[0],
-            name=row[1],
-            description=row[2],
-            start_date=row[3],
-            end_date=row[4],
-            status=row[5]
-        ))
+    Args:
+        project_ids: The IDs of the projects to retrieve
+        
+    Returns:
+        Dict mapping project ID to Project object; missing IDs are left out
+    """
+    if not project_ids:
+        return {}
     
-    return projects
+    query = """
+        SELECT id, name, description, start_date, end_date, status
+        FROM projects
+        WHERE id IN (SELECT UNNEST(?))
+    """
+    
+    projects = fetch_models(conn, query, [list(project_ids)], Project)
+    return {project.id: project for project in projects}
+
+PROJECT_BY_ID_SQL = """
+    SELECT id, name, description, start_date, end_date, status
+    FROM projects
+    WHERE id = ?
+"""
 
+@_memoized_lookup
 @with_connection(read_only=True)
 def get_project(conn, project_id: int) -> Optional[Project]:
     """
@@ -409,13 +634,7 @@ def get_project(conn, project_id: int) -> Optional[Project]:
     Returns:
         Project object if found, None otherwise
     """
-    query = """
-        SELECT id, name, description, start_date, end_date, status
-        FROM projects
-        WHERE id = ?
-    """
-    
-    result = conn.execute(query, [project_id]).fetchone()
+    result = conn.execute(PROJECT_BY_ID_SQL, [project_id]).fetchone()
     
     if result:
         return Project(
@@ -488,50 +707,48 @@ def delete_project(conn, project_id: int) -> bool:
     # Check if project has demands or allocations
     has_dependencies = conn.execute("""
         SELECT 
-            (SELECT COUNT(*) FROM demands WHERE project_id = ?) +
-            (SELECT COUNT(*) FROM allocations WHERE project_id = ?)
+            EXISTS (SELECT 1 FROM demands WHERE project_id = ?) OR
+            EXISTS (SELECT 1 FROM allocations WHERE project_id = ?)
     """, [project_id, project_id]).fetchone()[0]
     
-    if has_dependencies > 0:
+    if has_dependencies:
         return False
     
     # Delete project
     conn.execute("DELETE FROM projects WHERE id = ?", [project_id])
     return True
 
-@with_connection(read_only=True)
-def get_active_projects_count(conn) -> int:
+def get_active_projects_count() -> int:
     """
     Get the count of active projects.
     
     Returns:
         Count of active projects
     """
-    count = conn.execute(
-        "SELECT COUNT(*) FROM projects WHERE status IN ('active', 'planning')"
-    ).fetchone()[0]
-    return count
+    return get_dashboard_counts()[1]
 
 # Demand queries
+@_cached_read()
 @with_connection(read_only=True)
-def get_demands(conn, project_id: Optional[int] = None, status: Optional[str] = None) -> List[Demand]:
+def get_demands(conn, project_id: Optional[int] = None, status: Optional[str] = None, skill: Optional[str] = None) -> List[Demand]:
     """
-    Get all demands, optionally filtered by project_id and status.
+    Get all demands, optionally filtered by project_id, status and required skill.
     
     Args:
         project_id: Optional project ID to filter by
         status: Optional status to filter by
+        skill: Optional skill that must be among the demand's required skills
         
     Returns:
         List of Demand objects
     """
-    query = """
+    query = f"""
         SELECT 
             d.id, 
             d.project_id, 
             p.name as project_name,
             d.role_required, 
-            d.skills_required, 
+            {skill_list_sql("d.skills_required")} AS skills_required, 
             d.fte_required, 
             d.start_date, 
             d.end_date, 
@@ -552,30 +769,35 @@ def get_demands(conn, project_id: Optional[int] = None, status: Optional[str] =
         conditions.append("d.status = ?")
         params.append(status)
     
+    if skill:
+        conditions.append(f"list_contains({skill_list_sql('d.skills_required')}, ?)")
+        params.append(skill)
+    
     if conditions:
         query += " WHERE " + " AND ".join(conditions)
     
     query += " ORDER BY d.priority DESC, d.start_date"
     
-    result = conn.execute(query, params).fetchall()
-    
-    demands = []
-    for row in result:
-        demands.append(Demand(
-            id=row[0],
-            project_id=row[1],
-            project_name=row[2],
-            role_required=row[3],
-            skills_required=row[4].split(",") if row[4] else [],
-            fte_required=row[5],
-            start_date=row[6],
-            end_date=row[7],
-            priority=row[8],
-            status=row[9]
-        ))
-    
-    return demands
+    return fetch_models(conn, query, params, Demand)
 
+DEMAND_BY_ID_SQL = f"""
+    SELECT 
+        d.id, 
+        d.project_id, 
+        p.name as project_name,
+        d.role_required, 
+        {skill_list_sql("d.skills_required")}, 
+        d.fte_required, 
+        d.start_date, 
+        d.end_date, 
+        d.priority,
+        d.status
+    FROM demands d
+    JOIN projects p ON d.project_id = p.id
+    WHERE d.id = ?
+"""
+
+@_memoized_lookup
 @with_connection(read_only=True)
 def get_demand(conn, demand_id: int) -> Optional[Demand]:
     """
@@ -587,24 +809,7 @@ def get_demand(conn, demand_id: int) -> Optional[Demand]:
     Returns:
         Demand object if found, None otherwise
     """
-    query = """
-        SELECT 
-            d.id, 
-            d.project_id, 
-            p.name as project_name,
-            d.role_required, 
-            d.skills_required, 
-            d.fte_required, 
-            d.start_date, 
-            d.end_date, 
-            d.priority,
-            d.status
-        FROM demands d
-        JOIN projects p ON d.project_id = p.id
-        WHERE d.id = ?
-    """
-    
-    result = conn.execute(query, [demand_id]).fetchone()
+    result = conn.execute(DEMAND_BY_ID_SQL, [demand_id]).fetchone()
     
     if result:
         return Demand(
@@ -612,7 +817,7 @@ def get_demand(conn, demand_id: int) -> Optional[Demand]:
             project_id=result[1],
             project_name=result[2],
             role_required=result[3],
-            skills_required=result[4].split(",") if result[4] else [],
+            skills_required=result[4],
             fte_required=result[5],
             start_date=result[6],
             end_date=result[7],
@@ -622,30 +827,46 @@ def get_demand(conn, demand_id: int) -> Optional[Demand]:
     
     return None
 
-@with_connection()
-def save_demand(conn, demand: Demand) -> int:
+def _write_demand(conn, demand: Demand) -> Tuple[int, date, date]:
     """
-    Save a demand to the database.
+    Insert or update one demand row on the caller's transaction.
     
     Args:
+        conn: Database connection
         demand: The Demand object to save
         
     Returns:
-        The ID of the saved demand
+        Tuple of (demand ID, first affected date, last affected date), where
+        the affected dates cover the demand both before and after the write
     """
     skills_str = ",".join(demand.skills_required) if demand.skills_required else ""
     
+    # Months covered by the demand before and after the write
+    affected_start, affected_end = demand.start_date, demand.end_date
+    
     if demand.id:
+        previous_span = _get_date_span(conn, "demands", demand.id)
+        if previous_span:
+            affected_start = min(affected_start, previous_span[0])
+            affected_end = max(affected_end, previous_span[1])
+        
+        # project_id has a foreign key index, and DuckDB runs an UPDATE of an
+        # indexed column as a delete plus insert, which fails while
+        # allocations reference the demand; only set it when it changes
+        conn.execute(
+            "UPDATE demands SET project_id = ? WHERE id = ? AND project_id <> ?",
+            [demand.project_id, demand.id, demand.project_id]
+        )
+        
         # Update existing demand
         query = """
             UPDATE demands
-            SET project_id = ?, role_required = ?, skills_required = ?, 
+            SET role_required = ?, skills_required = ?, 
                 fte_required = ?, start_date = ?, end_date = ?, 
                 priority = ?, status = ?
             WHERE id = ?
         """
         conn.execute(query, [
-            demand.project_id, 
             demand.role_required, 
             skills_str, 
             demand.fte_required,
@@ -678,11 +899,101 @@ def save_demand(conn, demand: Demand) -> int:
         ]).fetchone()
         demand_id = result[0]
     
-    # Update monthly allocations
-    update_monthly_allocations()
+    return demand_id, affected_start, affected_end
+
+@with_connection()
+def save_demand(conn, demand: Demand) -> int:
+    """
+    Save a demand to the database.
+    
+    Args:
+        demand: The Demand object to save
+        
+    Returns:
+        The ID of the saved demand
+    """
+    # The span lookup and the write see the same snapshot
+    with tx(conn):
+        demand_id, affected_start, affected_end = _write_demand(conn, demand)
+    
+    # Flag the affected months for the next monthly refresh
+    _mark_monthly_dirty(affected_start, affected_end)
     
     return demand_id
 
+@with_connection()
+def save_demands(conn, demands: List[Demand]) -> List[int]:
+    """
+    Save many new or existing demands in one transaction.
+    
+    The monthly rollup is flagged once for the combined date range.
+    
+    Args:
+        demands: The Demand objects to save
+        
+    Returns:
+        The IDs of the saved demands, in order
+    """
+    if not demands:
+        return []
+    
+    demand_ids = []
+    affected_starts = []
+    affected_ends = []
+    with tx(conn):
+        for demand in demands:
+            demand_id, affected_start, affected_end = _write_demand(conn, demand)
+            demand_ids.append(demand_id)
+            affected_starts.append(affected_start)
+            affected_ends.append(affected_end)
+    
+    # Flag the affected months for the next monthly refresh
+    _mark_monthly_dirty(min(affected_starts), max(affected_ends))
+    
+    return demand_ids
+
+@with_connection()
+def save_demands_bulk(conn, demands: List[Demand]) -> List[int]:
+    """
+    Insert many new demands in one statement.
+    
+    The monthly rollup is flagged once for the combined date range.
+    
+    Args:
+        demands: The Demand objects to insert
+        
+    Returns:
+        The IDs of the inserted demands, in order
+    """
+    if not demands:
+        return []
+    
+    rows = [
+        (
+            demand.project_id,
+            demand.role_required,
+            ",".join(demand.skills_required) if demand.skills_required else "",
+            demand.fte_required,
+            demand.start_date,
+            demand.end_date,
+            demand.priority,
+            demand.status
+        )
+        for demand in demands
+    ]
+    demand_ids = insert_rows(conn, "demands", [
+        "project_id", "role_required", "skills_required", "fte_required",
+        "start_date", "end_date", "priority", "status"
+    ], rows)
+    
+    # Flag the affected months for the next monthly refresh
+    _mark_monthly_dirty(
+        min(demand.start_date for demand in demands),
+        max(demand.end_date for demand in demands)
+    )
+    
+    return demand_ids
+
 @with_connection()
 def delete_demand(conn, demand_id: int) -> bool:
     """
@@ -694,41 +1005,45 @@ def delete_demand(conn, demand_id: int) -> bool:
     Returns:
         True if the demand was deleted, False otherwise
     """
-    # Check if demand has allocations
-    has_allocations = conn.execute(
-        "SELECT COUNT(*) FROM allocations WHERE demand_id = ?", 
-        [demand_id]
-    ).fetchone()[0]
-    
-    if has_allocations > 0:
-        return False
-    
-    # Delete demand
-    conn.execute("DELETE FROM demands WHERE id = ?", [demand_id])
+    with tx(conn):
+        # Check if demand has allocations
+        has_allocations = conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM allocations WHERE demand_id = ?)", 
+            [demand_id]
+        ).fetchone()[0]
+        
+        if has_allocations:
+            return False
+        
+        span = _get_date_span(conn, "demands", demand_id)
+        
+        # Delete demand
+        conn.execute("DELETE FROM demands WHERE id = ?", [demand_id])
     
-    # Update monthly allocations
-    update_monthly_allocations()
+    # Flag the affected months for the next monthly refresh
+    if span:
+        _mark_monthly_dirty(*span)
     
     return True
 
-@with_connection(read_only=True)
-def get_open_demands_count(conn) -> int:
+def get_open_demands_count() -> int:
     """
     Get the count of open demands.
     
     Returns:
         Count of open demands
     """
-    count = conn.execute(
-        "SELECT COUNT(*) FROM demands WHERE status IN ('open', 'partially_filled')"
-    ).fetchone()[0]
-    return count
+    return get_dashboard_counts()[2]
 
 # Allocation queries
+@_cached_read()
 @with_connection(read_only=True)
-def get_allocations(conn, person_id: Optional[int] = None, project_id: Optional[int] = None, demand_id: Optional[int] = None) -> List[Allocation]:
+def get_allocations_arrow(conn, person_id: Optional[int] = None, project_id: Optional[int] = None, demand_id: Optional[int] = None) -> pa.Table:
     """
-    Get all allocations, optionally filtered by person_id, project_id, or demand_id.
+    Get all allocations as an Arrow table, optionally filtered by person_id,
+    project_id, or demand_id.
+    
+    For callers that aggregate or plot columns and don't need Allocation objects.
     
     Args:
         person_id: Optional person ID to filter by
@@ -736,7 +1051,7 @@ def get_allocations(conn, person_id: Optional[int] = None, project_id: Optional[
         demand_id: Optional demand ID to filter by
         
     Returns:
-        List of Allocation objects
+        pyarrow Table with the Allocation fields as columns
     """
     query = """
         SELECT 
@@ -753,7 +1068,6 @@ def get_allocations(conn, person_id: Optional[int] = None, project_id: Optional[
         FROM allocations a
         JOIN people p ON a.person_id = p.id
         JOIN projects pr ON a.project_id = pr.id
-        LEFT JOIN demands d ON a.demand_id = d.id
     """
     
     conditions = []
@@ -776,24 +1090,40 @@ def get_allocations(conn, person_id: Optional[int] = None, project_id: Optional[
     
     query += " ORDER BY a.start_date"
     
-    result = conn.execute(query, params).fetchall()
-    
-    allocations = []
-    for row in result:
-        allocations.append(Allocation(
-            id=row[0],
-            person_id=row[1],
-            person_name=row[2],
-            project_id=row[3],
-            project_name=row[4],
-            demand_id=row[5],
-            fte_allocated=row[6],
-            start_date=row[7],
-            end_date=row[8],
-            notes=row[9]
-        ))
-    
-    return allocations
+    return fetch_arrow(conn, query, params)
+
+def get_allocations(person_id: Optional[int] = None, project_id: Optional[int] = None, demand_id: Optional[int] = None) -> List[Allocation]:
+    """
+    Get all allocations, optionally filtered by person_id, project_id, or demand_id.
+    
+    Args:
+        person_id: Optional person ID to filter by
+        project_id: Optional project ID to filter by
+        demand_id: Optional demand ID to filter by
+        
+    Returns:
+        List of Allocation objects
+    """
+    table = get_allocations_arrow(person_id, project_id, demand_id)
+    return [Allocation(**row) for row in table.to_pylist()]
+
+ALLOCATION_BY_ID_SQL = """
+    SELECT 
+        a.id, 
+        a.person_id, 
+        p.name as person_name,
+        a.project_id, 
+        pr.name as project_name,
+        a.demand_id,
+        a.fte_allocated, 
+        a.start_date, 
+        a.end_date, 
+        a.notes
+    FROM allocations a
+    JOIN people p ON a.person_id = p.id
+    JOIN projects pr ON a.project_id = pr.id
+    WHERE a.id = ?
+"""
 
 @with_connection(read_only=True)
 def get_allocation(conn, allocation_id: int) -> Optional[Allocation]:
@@ -806,26 +1136,7 @@ def get_allocation(conn, allocation_id: int) -> Optional[Allocation]:
     Returns:
         Allocation object if found, None otherwise
     """
-    query = """
-        SELECT 
-            a.id, 
-            a.person_id, 
-            p.name as person_name,
-            a.project_id, 
-            pr.name as project_name,
-            a.demand_id,
-            a.fte_allocated, 
-            a.start_date, 
-            a.end_date, 
-            a.notes
-        FROM allocations a
-        JOIN people p ON a.person_id = p.id
-        JOIN projects pr ON a.project_id = pr.id
-        LEFT JOIN demands d ON a.demand_id = d.id
-        WHERE a.id = ?
-    """
-    
-    result = conn.execute(query, [allocation_id]).fetchone()
+    result = conn.execute(ALLOCATION_BY_ID_SQL, [allocation_id]).fetchone()
     
     if result:
         return Allocation(
@@ -843,18 +1154,35 @@ def get_allocation(conn, allocation_id: int) -> Optional[Allocation]:
     
     return None
 
-@with_connection()
-def save_allocation(conn, allocation: Allocation) -> int:
+def _write_allocation(conn, allocation: Allocation) -> Tuple[int, date, date, List[int]]:
     """
-    Save an allocation to the database.
+    Insert or update one allocation row on the caller's transaction.
     
     Args:
+        conn: Database connection
         allocation: The Allocation object to save
         
     Returns:
-        The ID of the saved allocation
+        Tuple of (allocation ID, first affected date, last affected date,
+        affected demand IDs), where the dates and demands cover the allocation
+        both before and after the write
     """
+    # Months and demands covered by the allocation before and after the write
+    affected_start, affected_end = allocation.start_date, allocation.end_date
+    demand_ids = [allocation.demand_id] if allocation.demand_id else []
+    
     if allocation.id:
+        previous = conn.execute(
+            "SELECT start_date, end_date, demand_id FROM allocations WHERE id = ?",
+            [allocation.id]
+        ).fetchone()
+        if previous:
+            affected_start = min(affected_start, previous[0])
+            affected_end = max(affected_end, previous[1])
+            # Moving an allocation off a demand changes that demand's status too
+            if previous[2] and previous[2] != allocation.demand_id:
+                demand_ids.append(previous[2])
+        
         # Update existing allocation
         query = """
             UPDATE allocations
@@ -894,15 +1222,117 @@ def save_allocation(conn, allocation: Allocation) -> int:
         ]).fetchone()
         allocation_id = result[0]
     
-    # If allocation is linked to a demand, update the demand status
-    if allocation.demand_id:
-        update_demand_status(allocation.demand_id)
+    return allocation_id, affected_start, affected_end, demand_ids
+
+@with_connection()
+def save_allocation(conn, allocation: Allocation) -> int:
+    """
+    Save an allocation to the database.
     
-    # Update monthly allocations
-    update_monthly_allocations()
+    Args:
+        allocation: The Allocation object to save
+        
+    Returns:
+        The ID of the saved allocation
+    """
+    # The allocation write and the demand status it implies commit together
+    with tx(conn):
+        allocation_id, affected_start, affected_end, demand_ids = _write_allocation(conn, allocation)
+        
+        # Update the status of the demands the allocation was or is linked to
+        if demand_ids:
+            _refresh_demand_status(conn, demand_ids)
+    
+    # Flag the affected months for the next monthly refresh
+    _mark_monthly_dirty(affected_start, affected_end)
     
     return allocation_id
 
+@with_connection()
+def save_allocations(conn, allocations: List[Allocation]) -> List[int]:
+    """
+    Save many new or existing allocations in one transaction.
+    
+    Linked demand statuses are recomputed once at the end, and the monthly
+    rollup is flagged once for the combined date range.
+    
+    Args:
+        allocations: The Allocation objects to save
+        
+    Returns:
+        The IDs of the saved allocations, in order
+    """
+    if not allocations:
+        return []
+    
+    allocation_ids = []
+    affected_starts = []
+    affected_ends = []
+    demand_ids = set()
+    with tx(conn):
+        for allocation in allocations:
+            allocation_id, affected_start, affected_end, affected_demands = _write_allocation(conn, allocation)
+            allocation_ids.append(allocation_id)
+            affected_starts.append(affected_start)
+            affected_ends.append(affected_end)
+            demand_ids.update(affected_demands)
+        
+        if demand_ids:
+            _refresh_demand_status(conn, sorted(demand_ids))
+    
+    # Flag the affected months for the next monthly refresh
+    _mark_monthly_dirty(min(affected_starts), max(affected_ends))
+    
+    return allocation_ids
+
+@with_connection()
+def save_allocations_bulk(conn, allocations: List[Allocation]) -> List[int]:
+    """
+    Insert many new allocations in one transaction.
+    
+    Linked demand statuses are recomputed with one UPDATE, and the monthly
+    rollup is flagged once for the combined date range.
+    
+    Args:
+        allocations: The Allocation objects to insert
+        
+    Returns:
+        The IDs of the inserted allocations, in order
+    """
+    if not allocations:
+        return []
+    
+    rows = [
+        (
+            allocation.person_id,
+            allocation.project_id,
+            allocation.demand_id,
+            allocation.fte_allocated,
+            allocation.start_date,
+            allocation.end_date,
+            allocation.notes
+        )
+        for allocation in allocations
+    ]
+    demand_ids = sorted({allocation.demand_id for allocation in allocations if allocation.demand_id})
+    
+    with tx(conn):
+        allocation_ids = insert_rows(conn, "allocations", [
+            "person_id", "project_id", "demand_id", "fte_allocated",
+            "start_date", "end_date", "notes"
+        ], rows)
+        
+        if demand_ids:
+            _refresh_demand_status(conn, demand_ids)
+    
+    # Flag the affected months for the next monthly refresh
+    _mark_monthly_dirty(
+        min(allocation.start_date for allocation in allocations),
+        max(allocation.end_date for allocation in allocations)
+    )
+    
+    return allocation_ids
+
 @with_connection()
 def delete_allocation(conn, allocation_id: int) -> bool:
     """
@@ -914,29 +1344,52 @@ def delete_allocation(conn, allocation_id: int) -> bool:
     Returns:
         True if the allocation was deleted, False otherwise
     """
-    # Get the demand_id before deleting
-    demand_id = conn.execute(
-        "SELECT demand_id FROM allocations WHERE id = ?", 
-        [allocation_id]
-    ).fetchone()
-    
-    if demand_id and demand_id[0]:
-        demand_id = demand_id[0]
-    else:
-        demand_id = None
-    
-    # Delete allocation
-    conn.execute("DELETE FROM allocations WHERE id = ?", [allocation_id])
-    
-    # If allocation was linked to a demand, update the demand status
-    if demand_id:
-        update_demand_status(demand_id)
+    # Delete the allocation and refresh the linked demand's status together
+    with tx(conn):
+        row = conn.execute(
+            "DELETE FROM allocations WHERE id = ? RETURNING demand_id, start_date, end_date", 
+            [allocation_id]
+        ).fetchone()
+        
+        if not row:
+            return True
+        
+        demand_id, start_date, end_date = row
+        
+        # If allocation was linked to a demand, update the demand status
+        if demand_id:
+            _refresh_demand_status(conn, [demand_id])
     
-    # Update monthly allocations
-    update_monthly_allocations()
+    # Flag the affected months for the next monthly refresh
+    _mark_monthly_dirty(start_date, end_date)
     
     return True
 
+def _refresh_demand_status(conn, demand_ids: List[int]) -> None:
+    """
+    Recompute the status of demands from their allocations in a single UPDATE.
+    
+    Args:
+        conn: Database connection
+        demand_ids: The IDs of the demands to update
+    """
+    conn.execute("""
+        UPDATE demands
+        SET status = CASE
+            WHEN s.total_allocated = 0 THEN 'open'
+            WHEN s.total_allocated < demands.fte_required THEN 'partially_filled'
+            ELSE 'filled'
+        END
+        FROM (
+            SELECT d.id, COALESCE(SUM(a.fte_allocated), 0) AS total_allocated
+            FROM demands d
+            LEFT JOIN allocations a ON a.demand_id = d.id
+            WHERE d.id IN (SELECT UNNEST(?))
+            GROUP BY d.id
+        ) s
+        WHERE demands.id = s.id
+    """, [demand_ids])
+
 @with_connection()
 def update_demand_status(conn, demand_id: int) -> None:
     """
@@ -945,40 +1398,15 @@ def update_demand_status(conn, demand_id: int) -> None:
     Args:
         demand_id: The ID of the demand to update
     """
-    # Get the demand
-    demand = get_demand(demand_id)
-    if not demand:
-        return
-    
-    # Get all allocations for this demand
-    allocations = get_allocations(demand_id=demand_id)
-    
-    # Calculate total allocated FTE
-    total_allocated = 0
-    for allocation in allocations:
-        total_allocated += allocation.fte_allocated
-    
-    # Update demand status based on allocated FTE
-    new_status = demand.status
-    if total_allocated == 0:
-        new_status = 'open'
-    elif total_allocated < demand.fte_required:
-        new_status = 'partially_filled'
-    else:
-        new_status = 'filled'
-    
-    # Update the demand
-    conn.execute(
-        "UPDATE demands SET status = ? WHERE id = ?",
-        [new_status, demand_id]
-    )
+    _refresh_demand_status(conn, [demand_id])
 
 # Monthly demand and allocation queries
-@with_connection(read_only=True)
-def get_monthly_demand_allocation(conn, start_date: date, end_date: date) -> List[MonthlyDemandAllocation]:
+def get_monthly_demand_allocation(start_date: date, end_date: date) -> List[MonthlyDemandAllocation]:
     """
     Get monthly demand and allocation data for the specified date range.
     
+    Results are cached per date range until the next write.
+    
     Args:
         start_date: Start date for data
         end_date: End date for data
@@ -986,68 +1414,122 @@ def get_monthly_demand_allocation(conn, start_date: date, end_date: date) -> Lis
     Returns:
         List of MonthlyDemandAllocation objects
     """
-    # Check if capacity_fte column exists
-    has_capacity = conn.execute("""
-        SELECT COUNT(*) FROM pragma_table_info('monthly_demand_allocation') 
-        WHERE name = 'capacity_fte'
-    """).fetchone()[0]
+    # Apply any writes made since the last refresh before reading; the
+    # refresh itself is a write, so read the generation afterwards
+    flush_monthly_allocations()
     
-    # Adjust query based on column existence
-    if has_capacity:
-        query = """
-            SELECT 
-                year_month,
-                demand_fte,
-                allocation_fte,
-                capacity_fte
-            FROM monthly_demand_allocation
-            WHERE year_month >= ? AND year_month <= ?
-            ORDER BY year_month
-        """
+    return _get_monthly_demand_allocation(start_date, end_date, _write_generation)
+
+@functools.lru_cache(maxsize=32)
+@with_connection(read_only=True)
+def _get_monthly_demand_allocation(conn, start_date: date, end_date: date, write_generation: int) -> List[MonthlyDemandAllocation]:
+    """Query the monthly rows for a date range; cached per write generation."""
+    from app.database.init_db import has_capacity_column
+    
+    if has_capacity_column(conn):
+        capacity_column = "capacity_fte"
     else:
-        # Create a temp view with capacity added (count of people)
-        conn.execute("""
-            CREATE OR REPLACE TEMP VIEW monthly_demand_allocation_with_capacity AS
-            SELECT 
-                mda.year_month,
-                mda.demand_fte,
-                mda.allocation_fte,
-                (SELECT COUNT(*) FROM people) AS capacity_fte
-            FROM monthly_demand_allocation mda
-        """)
-        
-        query = """
-            SELECT 
-                year_month,
-                demand_fte,
-                allocation_fte,
-                capacity_fte
-            FROM monthly_demand_allocation_with_capacity
-            WHERE year_month >= ? AND year_month <= ?
-            ORDER BY year_month
-        """
+        # Older schema without capacity_fte: use the people count
+        capacity_column = "(SELECT COUNT(*) FROM people) AS capacity_fte"
     
-    # Convert to first day of month for comparison
-    start_month = date(start_date.year, start_date.month, 1)
-    end_month = date(end_date.year, end_date.month, 1)
+    # Months are stored as their first day, so compare against the first
+    # day of the months containing start_date and end_date
+    query = f"""
+        SELECT 
+            year_month,
+            demand_fte,
+            allocation_fte,
+            {capacity_column}
+        FROM monthly_demand_allocation
+        WHERE year_month >= date_trunc('month', ?::DATE)
+          AND year_month <= date_trunc('month', ?::DATE)
+        ORDER BY year_month
+    """
     
-    result = conn.execute(query, [start_month, end_month]).fetchall()
+    return fetch_models(conn, query, [start_date, end_date], MonthlyDemandAllocation)
+
+def get_monthly_refreshed_at() -> Optional[datetime]:
+    """
+    Get the time the monthly_demand_allocation table was last refreshed.
     
-    monthly_data = []
-    for row in result:
-        monthly_data.append(MonthlyDemandAllocation(
-            year_month=row[0],
-            demand_fte=row[1],
-            allocation_fte=row[2],
-            capacity_fte=row[3] if len(row) > 3 else 0
-        ))
+    Returns:
+        Timestamp of the last refresh, or None if it has never been refreshed
+    """
+    # Apply any pending refresh first, outside the read cursor, since the
+    # refresh is a write
+    flush_monthly_allocations()
     
-    return monthly_data
+    return _get_monthly_refreshed_at()
+
+@with_connection(read_only=True)
+def _get_monthly_refreshed_at(conn) -> Optional[datetime]:
+    """Read the monthly rollup's refresh time from refresh_log."""
+    result = conn.execute(
+        "SELECT refreshed_at FROM refresh_log WHERE table_name = 'monthly_demand_allocation'"
+    ).fetchone()
+    return result[0] if result else None
+
+# Months of monthly_demand_allocation made stale by writes since the last
+# refresh, merged into one (start, end) range; None when up to date
+_monthly_dirty_range: Optional[Tuple[date, date]] = None
+_monthly_dirty_lock = threading.Lock()
+
+def _mark_monthly_dirty(start_date: date, end_date: date) -> None:
+    """
+    Record that the months between start_date and end_date need re-aggregating.
+    
+    Writes only mark the range; the rebuild runs once in flush_monthly_allocations,
+    so a batch of N writes costs one refresh instead of N.
+    """
+    global _monthly_dirty_range
+    with _monthly_dirty_lock:
+        if _monthly_dirty_range is not None:
+            start_date = min(start_date, _monthly_dirty_range[0])
+            end_date = max(end_date, _monthly_dirty_range[1])
+        _monthly_dirty_range = (start_date, end_date)
+
+def flush_monthly_allocations() -> None:
+    """
+    Refresh monthly_demand_allocation for any months marked dirty by earlier writes.
+    
+    Called before the monthly data is read; cheap when nothing has changed.
+    """
+    global _monthly_dirty_range
+    with _monthly_dirty_lock:
+        dirty_range = _monthly_dirty_range
+        _monthly_dirty_range = None
+    
+    if dirty_range is None:
+        return
+    
+    try:
+        update_monthly_allocations(*dirty_range)
+    except Exception:
+        # Keep the range so the next flush retries it
+        _mark_monthly_dirty(*dirty_range)
+        raise
+
+def _get_date_span(conn, table: str, row_id: int) -> Optional[Tuple[date, date]]:
+    """Get the (start_date, end_date) of a demand or allocation row."""
+    result = conn.execute(
+        f"SELECT start_date, end_date FROM {table} WHERE id = ?", 
+        [row_id]
+    ).fetchone()
+    return (result[0], result[1]) if result else None
 
 @with_connection()
-def update_monthly_allocations(conn) -> None:
-    """Update the monthly_demand_allocation table with current data."""
-    # This function will be implemented in the init_db.py file
-    # and will be called whenever demand or allocation data changes
+def update_monthly_allocations(conn, start_date: Optional[date] = None, end_date: Optional[date] = None) -> None:
+    """
+    Update the monthly_demand_allocation table with current data.
+    
+    Without a date range the whole table is rebuilt.
+    
+    Args:
+        start_date: Optional start of the months affected by a write
+        end_date: Optional end of the months affected by a write
+    """
     from app.database.init_db import compute_monthly_allocations
-    compute_monthly_allocations(conn) 
\ No newline at end of file
+    
+    # Commit the delete and re-insert together
+    with tx(conn):
+        compute_monthly_allocations(conn, start_date, end_date)
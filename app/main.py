@@ -1,7 +1,7 @@
 import streamlit as st
 import os
 import sys
-from datetime import date, timedelta
+from datetime import date
 
 # Add the parent directory to the Python path so 'app' can be found
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,12 +12,20 @@ from app.components.projects_view import render_projects_view
 from app.components.demand_view import render_demand_view
 from app.components.allocations_view import render_allocations_view
 from app.components.dashboard import render_dashboard
+from app.database import DB_PATH
 from app.database.init_db import initialize_database
 from app.database.migrate_db import migrate_database
+from app.utils.date_utils import get_month_end
 
+@st.cache_resource(show_spinner=False)
 def check_database_initialization():
-    """Check if the database is initialized and initialize if it doesn't exist."""
-    if not os.path.exists("resource_flow.duckdb"):
+    """
+    Check if the database is initialized and initialize if it doesn't exist.
+    
+    Cached as a resource so initialization and migrations run once per
+    server process rather than on every rerun.
+    """
+    if not os.path.exists(DB_PATH):
         initialize_database()
     
     # Run database migrations
@@ -29,9 +37,7 @@ def setup_session_state():
     if "date_range" not in st.session_state:
         today = date.today()
         start_date = date(today.year, today.month, 1)  # First day of current month
-        end_date = date(today.year + 1 if today.month == 12 else today.year,
-                        1 if today.month == 12 else today.month + 6,
-                        1) - timedelta(days=1)  # Last day of 6 months from now
+        end_date = get_month_end(today.year, today.month + 5)  # Last day of the sixth month
         st.session_state.date_range = (start_date, end_date)
     
     # Default sidebar selection
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from datetime import date
 from typing import List, Optional, Dict, Any
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Person:
     """Person model representing an employee/resource."""
     name: str
@@ -12,14 +12,14 @@ class Person:
     team_name: Optional[str] = None
     id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Team:
     """Team model representing a group of people."""
     name: str
     description: str = ""
     id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Project:
     """Project model representing a project with timeline and status."""
     name: str
@@ -29,7 +29,7 @@ class Project:
     status: str = "planning"  # planning, active, completed, cancelled
     id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Demand:
     """Demand model representing a request for resources on a project."""
     project_id: int
@@ -43,7 +43,7 @@ class Demand:
     project_name: Optional[str] = None
     id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Allocation:
     """Allocation model representing the assignment of a person to a project/demand."""
     person_id: int
@@ -57,7 +57,7 @@ class Allocation:
     project_name: Optional[str] = None
     id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MonthlyDemandAllocation:
     """Monthly aggregated demand and allocation data for reporting."""
     year_month: date  # First day of month
@@ -65,7 +65,7 @@ class MonthlyDemandAllocation:
     allocation_fte: float
     capacity_fte: float = 0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TeamAllocation:
     """Team allocation data including capacity and utilization."""
     team_id: int
@@ -3,6 +3,11 @@ import pandas as pd
 from datetime import date, datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple, Union
 
+from app.database.queries import flush_monthly_allocations
+
+# Rollup table refreshed lazily; readers flush it before querying
+MONTHLY_ROLLUP_TABLE = 'monthly_demand_allocation'
+
 def filter_dataframe_by_date(df: pl.DataFrame, 
                             start_date: date, 
                             end_date: date, 
@@ -24,38 +29,89 @@ def filter_dataframe_by_date(df: pl.DataFrame,
         (pl.col(date_column) <= end_date)
     )
 
-def aggregate_by_month(df: pl.DataFrame, 
-                      date_column: str = 'year_month', 
-                      value_columns: List[str] = None) -> pl.DataFrame:
+def filter_by_date_sql(conn,
+                       table: str,
+                       start_date: date,
+                       end_date: date,
+                       date_column: str = 'year_month') -> pl.DataFrame:
     """
-    Aggregate a Polars DataFrame by month
+    Load only the rows of a table within a date range
+    
+    The range is applied in DuckDB as a half-open interval, so only
+    matching rows are transferred and zonemaps on the date column can
+    skip row groups. Prefer this over filter_dataframe_by_date when the
+    data hasn't been loaded yet. Reading the monthly rollup first
+    refreshes any months left dirty by earlier writes.
     
     Args:
-        df (pl.DataFrame): DataFrame to aggregate
+        conn: Database connection
+        table (str): Table or view to read
+        start_date (date): Start date for filter
+        end_date (date): End date for filter, inclusive
+        date_column (str): Column name with date values
+        
+    Returns:
+        pl.DataFrame: Rows within the date range
+    """
+    if table == MONTHLY_ROLLUP_TABLE:
+        flush_monthly_allocations()
+    
+    query = f"""
+        SELECT * FROM {table}
+        WHERE {date_column} >= ? AND {date_column} < ?
+    """
+    return conn.execute(query, [start_date, end_date + timedelta(days=1)]).pl()
+
+def aggregate_by_month_lazy(lf: pl.LazyFrame, 
+                           date_column: str = 'year_month', 
+                           value_columns: List[str] = None) -> pl.LazyFrame:
+    """
+    Aggregate a Polars LazyFrame by month
+    
+    Args:
+        lf (pl.LazyFrame): LazyFrame to aggregate
         date_column (str): Column name with date values
         value_columns (List[str]): Columns to aggregate
         
     Returns:
-        pl.DataFrame: Aggregated DataFrame
+        pl.LazyFrame: Aggregation plan, not yet collected
     """
+    schema = lf.collect_schema()
     if value_columns is None:
         # Try to detect numeric columns
-        value_columns = [col for col in df.columns if df[col].dtype in [pl.Float32, pl.Float64, pl.Int32, pl.Int64]]
+        value_columns = [col for col, dtype in schema.items() if dtype in [pl.Float32, pl.Float64, pl.Int32, pl.Int64]]
     
     # Create month column if not using year_month
     if date_column != 'year_month':
-        df = df.with_column(
+        lf = lf.with_columns(
             pl.col(date_column).dt.truncate('1mo').alias('year_month')
         )
         group_by = 'year_month'
     else:
         group_by = date_column
     
-    # Aggregate by month
-    return df.group_by(group_by).agg([
-        pl.sum(col).alias(col) for col in value_columns
+    # Aggregate by month; FTE figures need no more than Float32 precision
+    return lf.group_by(group_by).agg([
+        (pl.col(col).cast(pl.Float32) if schema[col].is_float() else pl.col(col)).sum().alias(col)
+        for col in value_columns
     ]).sort(group_by)
 
+def aggregate_by_month(df: pl.DataFrame, 
+                      date_column: str = 'year_month', 
+                      value_columns: List[str] = None) -> pl.DataFrame:
+    """
+    Aggregate a Polars DataFrame by month
+    
+    Args:
+        df (pl.DataFrame): DataFrame to aggregate
+        date_column (str): Column name with date values
+        value_columns (List[str]): Columns to aggregate
+        
+    Returns:
+        pl.DataFrame: Aggregated DataFrame
+    """
+    return aggregate_by_month_lazy(df.lazy(), date_column, value_columns).collect()
+
 def pivot_data(df: pl.DataFrame, 
               index_col: str, 
               column_col: str, 
@@ -72,20 +128,34 @@ def pivot_data(df: pl.DataFrame,
     Returns:
         pl.DataFrame: Pivoted DataFrame
     """
-    # Polars pivot is more basic than pandas, convert for advanced pivot
-    pd_df = df.to_pandas()
-    
-    pivot_df = pd.pivot_table(
-        pd_df,
-        values=value_col,
+    # Sorted rows and columns and zero-filled gaps, as pandas' pivot_table gave
+    return df.pivot(
+        on=column_col,
         index=index_col,
-        columns=column_col,
-        aggfunc='sum',
-        fill_value=0
-    )
+        values=value_col,
+        aggregate_function='sum',
+        sort_columns=True
+    ).fill_null(0).sort(index_col)
+
+def calculate_rolling_average_lazy(lf: pl.LazyFrame, 
+                                  value_column: str, 
+                                  window_size: int = 3, 
+                                  date_column: str = 'year_month') -> pl.LazyFrame:
+    """
+    Calculate rolling average on a Polars LazyFrame
     
-    # Convert back to polars
-    return pl.from_pandas(pivot_df.reset_index())
+    Args:
+        lf (pl.LazyFrame): LazyFrame to process
+        value_column (str): Column to calculate rolling average
+        window_size (int): Window size for rolling average
+        date_column (str): Column name with date values
+        
+    Returns:
+        pl.LazyFrame: Plan adding the rolling average, not yet collected
+    """
+    return lf.sort(date_column).with_columns(
+        pl.col(value_column).rolling_mean(window_size).alias(f"{value_column}_rolling_avg")
+    )
 
 def calculate_rolling_average(df: pl.DataFrame, 
                              value_column: str, 
@@ -103,27 +173,80 @@ def calculate_rolling_average(df: pl.DataFrame,
     Returns:
         pl.DataFrame: DataFrame with rolling average
     """
-    # Sort by date
-    sorted_df = df.sort(date_column)
+    return calculate_rolling_average_lazy(df.lazy(), value_column, window_size, date_column).collect()
+
+def rolling_avg_sql(conn,
+                    table: str,
+                    value_column: str,
+                    window_size: int = 3,
+                    date_column: str = 'year_month') -> pl.DataFrame:
+    """
+    Calculate a rolling average in DuckDB for data that lives in a table
     
-    # Calculate rolling average
-    result = sorted_df.with_column(
-        pl.col(value_column).rolling_mean(window_size).alias(f"{value_column}_rolling_avg")
-    )
+    Same result as calculate_rolling_average, computed with a window
+    function so the rows aren't loaded into Polars first. Reading the
+    monthly rollup first refreshes any months left dirty by earlier writes.
+    
+    Args:
+        conn: Database connection
+        table (str): Table or view to read
+        value_column (str): Column to calculate rolling average
+        window_size (int): Window size for rolling average
+        date_column (str): Column name with date values
+        
+    Returns:
+        pl.DataFrame: Table rows with the rolling average column, sorted by date
+    """
+    if table == MONTHLY_ROLLUP_TABLE:
+        flush_monthly_allocations()
     
-    return result
+    # rolling_mean leaves the first window_size - 1 rows null; match that
+    query = f"""
+        SELECT 
+            *,
+            CASE WHEN row_number() OVER (ORDER BY {date_column}) >= {int(window_size)}
+                 THEN AVG({value_column}) OVER (
+                     ORDER BY {date_column}
+                     ROWS BETWEEN {int(window_size) - 1} PRECEDING AND CURRENT ROW
+                 )
+            END AS {value_column}_rolling_avg
+        FROM {table}
+        ORDER BY {date_column}
+    """
+    return conn.execute(query).pl()
 
 def convert_dataframe_for_plotly(df: pl.DataFrame) -> pd.DataFrame:
     """
     Convert a Polars DataFrame to Pandas for Plotly
     
+    The pandas columns are Arrow-backed extension arrays wrapping the
+    Polars buffers, so no column data is copied.
+    
     Args:
         df (pl.DataFrame): Polars DataFrame
         
     Returns:
         pd.DataFrame: Pandas DataFrame
     """
-    return df.to_pandas()
+    return df.to_pandas(use_pyarrow_extension_array=True)
+
+def format_date_column_lazy(lf: pl.LazyFrame, 
+                           date_column: str = 'year_month',
+                           format: str = '%b %Y') -> pl.LazyFrame:
+    """
+    Format a date column in a Polars LazyFrame
+    
+    Args:
+        lf (pl.LazyFrame): LazyFrame to process
+        date_column (str): Column name with date values
+        format (str): Date format string
+        
+    Returns:
+        pl.LazyFrame: Plan adding the formatted date column, not yet collected
+    """
+    return lf.with_columns(
+        pl.col(date_column).dt.strftime(format).alias(f"{date_column}_formatted")
+    )
 
 def format_date_column(df: pl.DataFrame, 
                       date_column: str = 'year_month',
@@ -139,8 +262,28 @@ def format_date_column(df: pl.DataFrame,
     Returns:
         pl.DataFrame: DataFrame with formatted date column
     """
-    return df.with_column(
-        pl.col(date_column).dt.strftime(format).alias(f"{date_column}_formatted")
+    return format_date_column_lazy(df.lazy(), date_column, format).collect()
+
+def calculate_percentage_lazy(lf: pl.LazyFrame, 
+                             numerator: str, 
+                             denominator: str, 
+                             new_column: str) -> pl.LazyFrame:
+    """
+    Calculate percentage in a Polars LazyFrame
+    
+    Args:
+        lf (pl.LazyFrame): LazyFrame to process
+        numerator (str): Column name for numerator
+        denominator (str): Column name for denominator
+        new_column (str): Name for the new percentage column
+        
+    Returns:
+        pl.LazyFrame: Plan adding the percentage column, not yet collected
+    """
+    return lf.with_columns(
+        (pl.col(numerator).cast(pl.Float32) / pl.col(denominator).cast(pl.Float32) * 100.0)
+        .cast(pl.Float32)
+        .alias(new_column)
     )
 
 def calculate_percentage(df: pl.DataFrame, 
@@ -159,9 +302,7 @@ def calculate_percentage(df: pl.DataFrame,
     Returns:
         pl.DataFrame: DataFrame with percentage column
     """
-    return df.with_column(
-        (pl.col(numerator) / pl.col(denominator) * 100.0).alias(new_column)
-    )
+    return calculate_percentage_lazy(df.lazy(), numerator, denominator, new_column).collect()
 
 def merge_dataframes(left_df: pl.DataFrame, 
                     right_df: pl.DataFrame, 
@@ -185,6 +326,9 @@ def classify_gap(gap: float) -> str:
     """
     Classify a resource gap
     
+    Scalar version for single values; add_gap_classification applies the
+    same thresholds to a whole column.
+    
     Args:
         gap (float): Resource gap value
         
@@ -211,9 +355,14 @@ def add_gap_classification(df: pl.DataFrame, gap_column: str) -> pl.DataFrame:
     Returns:
         pl.DataFrame: DataFrame with gap classification
     """
-    # Convert to pandas for vectorized custom function
-    pd_df = df.to_pandas()
-    pd_df['gap_classification'] = pd_df[gap_column].apply(classify_gap)
+    # Same thresholds as classify_gap, evaluated as one Polars expression
+    gap = pl.col(gap_column)
+    classification = (
+        pl.when(gap >= 0.5).then(pl.lit("surplus"))
+        .when(gap >= -0.1).then(pl.lit("balanced"))
+        .when(gap >= -0.5).then(pl.lit("deficit"))
+        .otherwise(pl.lit("critical"))
+        .alias("gap_classification")
+    )
     
-    # Convert back to polars
-    return pl.from_pandas(pd_df) 
\ No newline at end of file
+    return df.with_columns(classification) 
\ No newline at end of file
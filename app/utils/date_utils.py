@@ -2,6 +2,23 @@ from datetime import date, datetime, timedelta
 from typing import Tuple, List, Dict, Optional
 import calendar
 
+import polars as pl
+
+def get_month_end(year: int, month: int) -> date:
+    """
+    Get the last day of a given month
+    
+    Args:
+        year (int): Year
+        month (int): Month, counting on from January of year; 13 is
+            January of the following year
+        
+    Returns:
+        date: Last day of the month
+    """
+    # The day before the first of the following month
+    return date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
 def get_month_start_end(year: int, month: int) -> Tuple[date, date]:
     """
     Get the start and end dates for a given month
@@ -13,15 +30,7 @@ def get_month_start_end(year: int, month: int) -> Tuple[date, date]:
     Returns:
         Tuple[date, date]: (start_date, end_date)
     """
-    start_date = date(year, month, 1)
-    
-    # Calculate last day of month
-    if month == 12:
-        end_date = date(year, 12, 31)
-    else:
-        end_date = date(year, month + 1, 1) - timedelta(days=1)
-    
-    return (start_date, end_date)
+    return (date(year, month, 1), get_month_end(year, month))
 
 def get_quarter_start_end(year: int, quarter: int) -> Tuple[date, date]:
     """
@@ -71,18 +80,19 @@ def get_months_between(start_date: date, end_date: date) -> List[date]:
     Returns:
         List[date]: List of month start dates
     """
-    months = []
-    current_date = date(start_date.year, start_date.month, 1)
+    first_month = date(start_date.year, start_date.month, 1)
+    if first_month > end_date:
+        return []
     
-    while current_date <= end_date:
-        months.append(current_date)
-        
-        if current_date.month == 12:
-            current_date = date(current_date.year + 1, 1, 1)
-        else:
-            current_date = date(current_date.year, current_date.month + 1, 1)
-    
-    return months
+    return pl.date_range(first_month, end_date, interval="1mo", eager=True).to_list()
+
+# strftime patterns for format_date_display, by format type
+_DATE_FORMATS = {
+    'short': '%m/%d/%Y',
+    'medium': '%b %d, %Y',
+    'long': '%B %d, %Y',
+    'month': '%b %Y',
+}
 
 def format_date_display(dt: date, format_type: str = 'short') -> str:
     """
@@ -95,18 +105,12 @@ def format_date_display(dt: date, format_type: str = 'short') -> str:
     Returns:
         str: Formatted date string
     """
-    if format_type == 'short':
-        return dt.strftime('%m/%d/%Y')
-    elif format_type == 'medium':
-        return dt.strftime('%b %d, %Y')
-    elif format_type == 'long':
-        return dt.strftime('%B %d, %Y')
-    elif format_type == 'month':
-        return dt.strftime('%b %Y')
-    elif format_type == 'month_year':
+    fmt = _DATE_FORMATS.get(format_type)
+    if fmt:
+        return dt.strftime(fmt)
+    if format_type == 'month_year':
         return f"{calendar.month_name[dt.month]} {dt.year}"
-    else:
-        return str(dt)
+    return str(dt)
 
 def date_range_to_text(start_date: date, end_date: date) -> str:
     """
@@ -3,6 +3,8 @@ from typing import Tuple, Optional, Dict, List
 from calendar import monthrange
 import polars as pl
 
+from app.database.queries import flush_monthly_allocations
+
 def calculate_days_in_period(start_date: date, end_date: date) -> int:
     """
     Calculate the number of days in a period
@@ -36,17 +38,39 @@ def calculate_months_in_period(start_date: date, end_date: date) -> float:
     month_diff = end_date.month - start_date.month
     full_months = year_diff * 12 + month_diff
     
-    # Calculate partial months
+    # Calculate partial months; within a single month this reduces to
+    # (end day - start day + 1) / days in month, so no special case is needed
     start_partial = (start_date.day - 1) / monthrange(start_date.year, start_date.month)[1]
     end_partial = end_date.day / monthrange(end_date.year, end_date.month)[1]
     
-    # Adjust for partial months
-    if start_date.month == end_date.month and start_date.year == end_date.year:
-        # Same month
-        return (end_date.day - start_date.day + 1) / monthrange(start_date.year, start_date.month)[1]
-    else:
-        # Different months
-        return full_months - start_partial + end_partial
+    return full_months - start_partial + end_partial
+
+def months_in_period_expr(start_column: str = "start_date", end_column: str = "end_date") -> pl.Expr:
+    """
+    Build a Polars expression computing calculate_months_in_period per row
+    
+    Args:
+        start_column (str): Column name with start dates
+        end_column (str): Column name with end dates
+        
+    Returns:
+        pl.Expr: Number of months in each row's period, with partial months
+    """
+    start = pl.col(start_column)
+    end = pl.col(end_column)
+    
+    # Day of the month's last day is the number of days in that month
+    start_days = start.dt.month_end().dt.day()
+    end_days = end.dt.month_end().dt.day()
+    
+    months = (
+        (end.dt.year() - start.dt.year()) * 12
+        + (end.dt.month() - start.dt.month())
+        - (start.dt.day() - 1) / start_days
+        + end.dt.day() / end_days
+    )
+    
+    return pl.when(start > end).then(0.0).otherwise(months)
     
 def calculate_fte_months(fte: float, start_date: date, end_date: date) -> float:
     """
@@ -67,6 +91,8 @@ def calculate_monthly_fte_distribution(fte: float, start_date: date, end_date: d
     """
     Calculate monthly distribution of FTE over a period
     
+    Use calculate_monthly_fte_distribution_df for many periods at once.
+    
     Args:
         fte (float): FTE allocation
         start_date (date): Start date
@@ -83,22 +109,17 @@ def calculate_monthly_fte_distribution(fte: float, start_date: date, end_date: d
     
     while current_date <= end_date:
         # Calculate last day of current month
-        _, last_day = monthrange(current_date.year, current_date.month)
-        month_end = date(current_date.year, current_date.month, last_day)
+        _, days_in_month = monthrange(current_date.year, current_date.month)
+        month_end = date(current_date.year, current_date.month, days_in_month)
         
-        # Calculate overlap period
+        # Overlap of the period with this month; never empty, as the loop
+        # only visits months between start_date and end_date
         period_start = max(start_date, current_date)
         period_end = min(end_date, month_end)
+        month_fte = fte * calculate_days_in_period(period_start, period_end) / days_in_month
         
-        # Calculate FTE for this month
-        if period_start <= period_end:
-            days_in_month = monthrange(current_date.year, current_date.month)[1]
-            days_in_period = calculate_days_in_period(period_start, period_end)
-            month_fte = fte * days_in_period / days_in_month
-            
-            # Format month key
-            month_key = f"{current_date.year}-{current_date.month:02d}"
-            result[month_key] = round(month_fte, 3)
+        month_key = f"{current_date.year}-{current_date.month:02d}"
+        result[month_key] = round(month_fte, 3)
         
         # Move to next month
         if current_date.month == 12:
@@ -108,6 +129,85 @@ def calculate_monthly_fte_distribution(fte: float, start_date: date, end_date: d
     
     return result
 
+def calculate_monthly_fte_distribution_df(df: pl.DataFrame, 
+                                          fte_column: str = "fte_allocated",
+                                          start_column: str = "start_date",
+                                          end_column: str = "end_date") -> pl.DataFrame:
+    """
+    Calculate the monthly distribution of FTE for every row of a DataFrame
+    
+    Each row is expanded to one row per month it overlaps, and its FTE is
+    prorated by the share of the month's days it covers.
+    
+    Args:
+        df (pl.DataFrame): DataFrame with an FTE and a start/end date per row
+        fte_column (str): Column name with FTE values
+        start_column (str): Column name with start dates
+        end_column (str): Column name with end dates
+        
+    Returns:
+        pl.DataFrame: Input columns plus month_start and month_fte, one row per row and month
+    """
+    start = pl.col(start_column)
+    end = pl.col(end_column)
+    
+    return (
+        df.lazy()
+        .filter(start <= end)
+        .with_columns(
+            pl.date_ranges(start.dt.month_start(), end, "1mo").alias("month_start")
+        )
+        .explode("month_start")
+        .with_columns(pl.col("month_start").dt.month_end().alias("_month_end"))
+        .with_columns(
+            (
+                pl.col(fte_column)
+                * ((pl.min_horizontal(end, "_month_end") - pl.max_horizontal(start, "month_start")).dt.total_days() + 1)
+                / pl.col("_month_end").dt.day()
+            ).alias("month_fte")
+        )
+        .drop("_month_end")
+        .collect()
+    )
+
+def monthly_distribution_all(conn, start_date: date, end_date: date) -> pl.DataFrame:
+    """
+    Calculate the monthly FTE distribution of every allocation in one query
+    
+    The database counterpart of calculate_monthly_fte_distribution_df: each
+    allocation is joined to the months it overlaps within the range and its
+    FTE prorated with the days_overlap macro.
+    
+    Args:
+        conn: Database connection
+        start_date (date): Start date; its whole month is included
+        end_date (date): End date; its whole month is included
+        
+    Returns:
+        pl.DataFrame: One row per allocation and month, with month_start and month_fte
+    """
+    return conn.execute("""
+        WITH months AS (
+            SELECT CAST(unnest(generate_series(
+                CAST(date_trunc('month', ?::DATE) AS TIMESTAMP),
+                CAST(date_trunc('month', ?::DATE) AS TIMESTAMP),
+                INTERVAL 1 MONTH
+            )) AS DATE) AS month_start
+        )
+        SELECT 
+            a.id AS allocation_id,
+            a.person_id,
+            a.project_id,
+            a.demand_id,
+            m.month_start,
+            a.fte_allocated * days_overlap(a.start_date, a.end_date, m.month_start)
+                / day(last_day(m.month_start)) AS month_fte
+        FROM months m
+        JOIN allocations a 
+          ON a.start_date <= last_day(m.month_start) AND a.end_date >= m.month_start
+        ORDER BY a.id, m.month_start
+    """, [start_date, end_date]).pl()
+
 def get_current_quarter_dates() -> Tuple[date, date]:
     """
     Get the start and end dates for the current quarter
@@ -137,10 +237,59 @@ def get_current_year_dates() -> Tuple[date, date]:
     today = date.today()
     return (date(today.year, 1, 1), date(today.year, 12, 31))
 
+def _fte_summary(start_date: date, end_date: date, total_demand: float, total_allocated: float) -> Dict[str, float]:
+    """Build the summary dict shared by calculate_fte_summary and fte_summary_sql."""
+    if total_demand > 0:
+        fulfillment_percentage = (total_allocated / total_demand) * 100
+    else:
+        fulfillment_percentage = 0.0
+    
+    return {
+        "total_days": calculate_days_in_period(start_date, end_date),
+        "total_months": calculate_months_in_period(start_date, end_date),
+        "total_demand": total_demand,
+        "total_allocated": total_allocated,
+        "total_gap": total_demand - total_allocated,
+        "fulfillment_percentage": fulfillment_percentage
+    }
+
+def fte_summary_sql(conn, start_date: date, end_date: date) -> Dict[str, float]:
+    """
+    Calculate FTE summary metrics in DuckDB from the monthly rollup
+    
+    Only the two totals cross the database boundary. Months are stored as
+    their first day, so the range covers the months containing start_date
+    through end_date. Months left dirty by earlier writes are refreshed
+    first, so the totals include them.
+    
+    Args:
+        conn: Database connection
+        start_date (date): Start date for calculation
+        end_date (date): End date for calculation
+        
+    Returns:
+        Dict[str, float]: Dictionary with summary metrics
+    """
+    flush_monthly_allocations()
+    
+    total_demand, total_allocated = conn.execute("""
+        SELECT 
+            COALESCE(SUM(demand_fte), 0),
+            COALESCE(SUM(allocation_fte), 0)
+        FROM monthly_demand_allocation
+        WHERE year_month >= date_trunc('month', ?::DATE)
+          AND year_month < ?
+    """, [start_date, end_date + timedelta(days=1)]).fetchone()
+    
+    return _fte_summary(start_date, end_date, total_demand, total_allocated)
+
 def calculate_fte_summary(df: pl.DataFrame, start_date: date, end_date: date) -> Dict[str, float]:
     """
     Calculate FTE summary metrics from a Polars DataFrame with allocation data
     
+    Prefer fte_summary_sql when the data is in the database rather than
+    already loaded.
+    
     Args:
         df (pl.DataFrame): DataFrame with allocation data
         start_date (date): Start date for calculation
@@ -149,34 +298,8 @@ def calculate_fte_summary(df: pl.DataFrame, start_date: date, end_date: date) ->
     Returns:
         Dict[str, float]: Dictionary with summary metrics
     """
-    total_days = calculate_days_in_period(start_date, end_date)
-    total_months = calculate_months_in_period(start_date, end_date)
-    
     # Check if DataFrame has the expected columns
     if "fte_demand" in df.columns and "fte_allocated" in df.columns:
-        total_demand = df["fte_demand"].sum()
-        total_allocated = df["fte_allocated"].sum()
-        total_gap = total_demand - total_allocated
-        
-        if total_demand > 0:
-            fulfillment_percentage = (total_allocated / total_demand) * 100
-        else:
-            fulfillment_percentage = 0.0
-        
-        return {
-            "total_days": total_days,
-            "total_months": total_months,
-            "total_demand": total_demand,
-            "total_allocated": total_allocated,
-            "total_gap": total_gap,
-            "fulfillment_percentage": fulfillment_percentage
-        }
+        return _fte_summary(start_date, end_date, df["fte_demand"].sum(), df["fte_allocated"].sum())
     else:
-        return {
-            "total_days": total_days,
-            "total_months": total_months,
-            "total_demand": 0.0,
-            "total_allocated": 0.0,
-            "total_gap": 0.0,
-            "fulfillment_percentage": 0.0
-        } 
\ No newline at end of file
+        return _fte_summary(start_date, end_date, 0.0, 0.0)
@@ -1,57 +1,157 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-import polars as pl
 import pandas as pd
 import numpy as np
-from datetime import date, datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from datetime import date
+from typing import List, Dict, Any, Optional
 
-def create_project_gantt(projects: List) -> go.Figure:
+# Interactive Plotly timelines slow down sharply past a few thousand bars
+MAX_GANTT_BARS = 1500
+
+PROJECT_STATUS_COLORS = {
+    "planning": "#64B5F6",  # Light Blue
+    "active": "#4CAF50",    # Green
+    "completed": "#9E9E9E", # Gray
+    "cancelled": "#F44336"  # Red
+}
+
+# Statuses outside the map keep the default palette
+DEMAND_STATUS_COLORS = {
+    "unfilled": "rgb(239, 85, 59)",   # Red for unfilled
+    "open": "rgb(239, 85, 59)",       # Red for open
+    "partially_filled": "rgb(255, 161, 90)",  # Orange for partially filled
+    "filled": "rgb(99, 110, 250)",    # Blue for filled
+    "cancelled": "rgb(155, 155, 155)" # Gray for cancelled
+}
+
+def _as_datetime64(values) -> np.ndarray:
     """
-    Create a Gantt chart for projects.
+    Convert a sequence of dates to a datetime64[ns] array in one pass.
     
     Args:
-        projects: List of Project objects
+        values: Sequence of date objects (None becomes NaT)
         
     Returns:
-        Plotly figure with the Gantt chart
+        NumPy datetime64[ns] array
     """
-    if not projects:
-        return go.Figure()
+    return np.array(values, dtype="datetime64[D]").astype("datetime64[ns]")
+
+def _merge_allocation_spans(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join back-to-back allocations of a person to the same project at the
+    same FTE into a single span, so the Gantt draws one bar per continuous
+    assignment.
+    
+    Only allocations where one starts the day after the other ends are
+    joined. Overlapping allocations, or ones at a different FTE, keep their
+    own bars so each bar's FTE is the load it actually carries.
+    
+    Args:
+        df: DataFrame with person_name, project_name, start_date, end_date,
+            fte_allocated and notes columns
+        
+    Returns:
+        DataFrame with one row per merged span
+    """
+    keys = ["person_name", "project_name", "fte_allocated"]
+    df = df.assign(
+        start_date=pd.to_datetime(df["start_date"]),
+        end_date=pd.to_datetime(df["end_date"])
+    ).sort_values(keys + ["start_date"], ignore_index=True)
+    
+    # A row continues the previous row's span when it has the same person,
+    # project and FTE and starts the day after that row ends
+    prev_end = df.groupby(keys, sort=False, dropna=False)["end_date"].shift()
+    span_id = (df["start_date"] != prev_end + pd.Timedelta(days=1)).cumsum()
+    
+    return (
+        df.groupby(keys + [span_id.rename("span")], sort=False, dropna=False)
+        .agg(
+            start_date=("start_date", "min"),
+            end_date=("end_date", "max"),
+            notes=("notes", lambda notes: "; ".join(dict.fromkeys(n for n in notes.dropna() if n)))
+        )
+        .reset_index(level="span", drop=True)
+        .reset_index()
+    )
+
+def _cap_bars(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """
+    Keep the chart to at most MAX_GANTT_BARS bars, telling the user when
+    rows are dropped.
     
-    # Convert to DataFrame
-    df = pd.DataFrame([
-        {
-            "id": project.id,
-            "name": project.name,
-            "start_date": project.start_date,
-            "end_date": project.end_date,
-            "status": project.status,
-            "description": project.description
-        }
-        for project in projects
-    ])
-    
-    # Create color mapping for status
-    color_map = {
-        "planning": "#64B5F6",  # Light Blue
-        "active": "#4CAF50",    # Green
-        "completed": "#9E9E9E", # Gray
-        "cancelled": "#F44336"  # Red
-    }
-    
-    # Create figure
+    Args:
+        df: DataFrame with one row per bar and a start_date column
+        kind: Plural name of the charted items, used in the messages
+        
+    Returns:
+        The DataFrame, or its earliest-starting MAX_GANTT_BARS rows
+    """
+    if len(df) <= MAX_GANTT_BARS:
+        return df
+    
+    st.warning(f"Showing the first {MAX_GANTT_BARS} of {len(df)} {kind} by start date.")
+    st.info("Use the filters to narrow the timeline.")
+    return df.nsmallest(MAX_GANTT_BARS, "start_date")
+
+# The timeline figure is cached on the content of its inputs, so a rerun
+# with unchanged data reuses the figure instead of rebuilding it; the TTL
+# keeps the "today" marker from going stale
+@st.cache_data(ttl=300, show_spinner=False, max_entries=32)
+def _build_timeline(
+    df: pd.DataFrame,
+    *,
+    y: str,
+    color: str,
+    hover_cols: List[str],
+    hover_template: str,
+    uid_prefix: str,
+    legend_title: str,
+    color_map: Optional[Dict[str, str]] = None,
+    width_col: Optional[str] = None,
+    legend: Optional[Dict[str, Any]] = None
+) -> go.Figure:
+    """
+    Create a timeline figure shared by the Gantt charts.
+    
+    Args:
+        df: DataFrame with start_date and end_date columns
+        y: Column for the rows of the chart
+        color: Column that splits the bars into traces
+        hover_cols: Columns passed to the hover template as customdata
+        hover_template: Hover template for every trace
+        uid_prefix: Prefix for the stable trace ids
+        legend_title: Legend title
+        color_map: Optional mapping from color values to colors
+        width_col: Optional FTE column that scales the bar widths
+        legend: Optional legend layout, which also turns the legend on
+        
+    Returns:
+        Plotly figure with the Gantt chart
+    """
     fig = px.timeline(
         df, 
         x_start="start_date", 
         x_end="end_date", 
-        y="name",
-        color="status",
-        color_discrete_map=color_map,
-        hover_data=["description"]
+        y=y,
+        color=color,
+        color_discrete_map=color_map or {},
+        hover_data=hover_cols
     )
     
+    # Stable trace ids let the frontend update the existing traces on
+    # rerender instead of rebuilding the chart. When a width column is
+    # given, bar width follows FTE (thicker bars for higher FTE), clipped
+    # to 0.2-1.0, with the border dropped in the same update; px.timeline
+    # makes one trace per color value, so each trace takes its own rows
+    for trace in fig.data:
+        update = {"uid": f"{uid_prefix}-{trace.name}"}
+        if width_col is not None:
+            fte = df.loc[df[color] == trace.name, width_col].to_numpy()
+            update.update(width=np.clip(fte, 0.2, 1.0).tolist(), marker_line_width=0)
+        trace.update(**update)
+    
     # Mark today's date with a vertical line
     today = date.today()
     fig.add_vline(x=today, line_width=2, line_dash="dash", line_color="red")
@@ -60,13 +160,121 @@ def create_project_gantt(projects: List) -> go.Figure:
     fig.update_layout(
         xaxis_title="",
         yaxis_title="",
-        legend_title="Status",
-        margin=dict(l=10, r=10, t=10, b=10),
+        legend_title=legend_title,
+        margin=dict(l=10, r=10, t=10, b=10)
     )
+    if legend is not None:
+        fig.update_layout(showlegend=True, legend=legend)
+    
+    fig.update_traces(hovertemplate=hover_template)
+    
+    return fig
+
+def _project_frame(projects: List) -> pd.DataFrame:
+    """
+    Build the Gantt DataFrame for a non-empty list of projects.
+    
+    Args:
+        projects: List of Project objects
+        
+    Returns:
+        DataFrame with one row per project bar
+    """
+    # Build the DataFrame column by column
+    df = pd.DataFrame({
+        "id": [project.id for project in projects],
+        "name": [project.name for project in projects],
+        "start_date": _as_datetime64([project.start_date for project in projects]),
+        "end_date": _as_datetime64([project.end_date for project in projects]),
+        "status": [project.status for project in projects],
+        "description": [project.description for project in projects]
+    }).astype({"status": "category"})
+    return _cap_bars(df, "projects")
+
+def _demand_frame(demands: List) -> pd.DataFrame:
+    """
+    Build the Gantt DataFrame for non-empty demands.
     
-    # Add hover template
-    fig.update_traces(
-        hovertemplate=
+    Args:
+        demands: List of Demand objects or DataFrame
+        
+    Returns:
+        DataFrame with one row per demand bar
+    """
+    if isinstance(demands, pd.DataFrame):
+        df = demands.assign(
+            start_date=pd.to_datetime(demands["start_date"]),
+            end_date=pd.to_datetime(demands["end_date"])
+        )
+    else:
+        # Build the DataFrame column by column
+        df = pd.DataFrame({
+            "id": [demand.id for demand in demands],
+            "project_name": [demand.project_name for demand in demands],
+            "role_required": [demand.role_required for demand in demands],
+            "skills_required": [", ".join(demand.skills_required) if demand.skills_required else "" for demand in demands],
+            "fte_required": [demand.fte_required for demand in demands],
+            "start_date": _as_datetime64([demand.start_date for demand in demands]),
+            "end_date": _as_datetime64([demand.end_date for demand in demands]),
+            "status": [demand.status for demand in demands],
+            "priority": [demand.priority for demand in demands]
+        })
+    
+    df = _cap_bars(df, "demands")
+    
+    # Low-cardinality labels as categories and FTE as float32 keep the
+    # frame and the serialized figure small
+    df = df.astype({"status": "category", "project_name": "category", "role_required": "category"})
+    df["fte_required"] = pd.to_numeric(df["fte_required"], downcast="float")
+    return df
+
+def _allocation_frame(allocations: List) -> pd.DataFrame:
+    """
+    Build the Gantt DataFrame for non-empty allocations, with back-to-back
+    spans merged.
+    
+    Args:
+        allocations: List of Allocation objects or DataFrame
+        
+    Returns:
+        DataFrame with one row per allocation bar
+    """
+    if isinstance(allocations, pd.DataFrame):
+        df = allocations
+    else:
+        # Build the DataFrame column by column
+        df = pd.DataFrame({
+            "id": [allocation.id for allocation in allocations],
+            "person_name": [allocation.person_name for allocation in allocations],
+            "project_name": [allocation.project_name for allocation in allocations],
+            "start_date": _as_datetime64([allocation.start_date for allocation in allocations]),
+            "end_date": _as_datetime64([allocation.end_date for allocation in allocations]),
+            "fte_allocated": [allocation.fte_allocated for allocation in allocations],
+            "notes": [allocation.notes if allocation.notes else "" for allocation in allocations]
+        })
+    
+    df = _cap_bars(_merge_allocation_spans(df), "allocations")
+    
+    # Cast after merging, so the groupby doesn't expand unused
+    # category combinations
+    df = df.astype({"person_name": "category", "project_name": "category"})
+    df["fte_allocated"] = pd.to_numeric(df["fte_allocated"], downcast="float")
+    return df
+
+def create_project_gantt(projects: List) -> go.Figure:
+    """
+    Create a Gantt chart for projects.
+    
+    Args:
+        projects: List of Project objects
+        
+    Returns:
+        Plotly figure with the Gantt chart
+    """
+    if not projects:
+        return go.Figure()
+    
+    hover_template = (
         "<b>%{y}</b><br>" +
         "Start: %{x[0]|%b %d, %Y}<br>" +
         "End: %{x[1]|%b %d, %Y}<br>" +
@@ -74,7 +282,16 @@ def create_project_gantt(projects: List) -> go.Figure:
         "<extra></extra>"
     )
     
-    return fig
+    return _build_timeline(
+        _project_frame(projects),
+        y="name",
+        color="status",
+        hover_cols=["description"],
+        hover_template=hover_template,
+        uid_prefix="project",
+        legend_title="Status",
+        color_map=PROJECT_STATUS_COLORS
+    )
 
 def create_demand_gantt(demands: List) -> go.Figure:
     """
@@ -87,82 +304,11 @@ def create_demand_gantt(demands: List) -> go.Figure:
         Plotly figure with the Gantt chart
     """
     # Handle empty input
-    if isinstance(demands, pd.DataFrame):
-        if demands.empty:
-            return go.Figure()
-        df = demands
-    elif not demands:
+    if isinstance(demands, pd.DataFrame) and demands.empty:
+        return go.Figure()
+    if not isinstance(demands, pd.DataFrame) and not demands:
         return go.Figure()
-    else:
-        # Convert list of objects to DataFrame
-        df = pd.DataFrame([{
-            "id": demand.id,
-            "project_name": demand.project_name,
-            "role_required": demand.role_required,
-            "skills_required": ", ".join(demand.skills_required) if demand.skills_required else "",
-            "fte_required": demand.fte_required,
-            "start_date": demand.start_date,
-            "end_date": demand.end_date,
-            "status": demand.status,
-            "priority": demand.priority
-        } for demand in demands])
-    
-    # Create figure
-    fig = px.timeline(
-        df, 
-        x_start="start_date", 
-        x_end="end_date", 
-        y="project_name",
-        color="status",
-        hover_data=["role_required", "skills_required", "fte_required"]
-    )
-    
-    # Customize colors
-    fig.update_traces(
-        marker_color=px.colors.qualitative.Bold,
-        marker_line_width=0
-    )
-    
-    # Status-based color mapping
-    color_map = {
-        "unfilled": "rgb(239, 85, 59)",   # Red for unfilled
-        "open": "rgb(239, 85, 59)",       # Red for open
-        "partially_filled": "rgb(255, 161, 90)",  # Orange for partially filled
-        "filled": "rgb(99, 110, 250)",    # Blue for filled
-        "cancelled": "rgb(155, 155, 155)" # Gray for cancelled
-    }
-    
-    # Apply color based on status
-    for i, row in df.iterrows():
-        status = row["status"]
-        if status in color_map:
-            if i < len(fig.data):
-                fig.data[i].marker.color = color_map[status]
-    
-    # Adjust bar width based on FTE (thicker bars for higher FTE)
-    widths = []
-    for i, row in df.iterrows():
-        # Normalize the width between 0.2 and 1.0 based on FTE
-        width = min(1.0, max(0.2, row["fte_required"]))
-        widths.append(width)
-    
-    # Apply widths to all traces
-    for trace in fig.data:
-        trace.update(width=widths)
-    
-    # Mark today's date with a vertical line
-    today = date.today()
-    fig.add_vline(x=today, line_width=2, line_dash="dash", line_color="red")
-    
-    # Customize layout
-    fig.update_layout(
-        xaxis_title="",
-        yaxis_title="",
-        legend_title="Status",
-        margin=dict(l=10, r=10, t=10, b=10)
-    )
     
-    # Improve hover information
     hover_template = (
         "Project: <b>%{y}</b><br>" +
         "Role: <b>%{customdata[0]}</b><br>" +
@@ -173,9 +319,18 @@ def create_demand_gantt(demands: List) -> go.Figure:
         "Status: <b>%{marker.color}</b><br>" +
         "<extra></extra>"
     )
-    fig.update_traces(hovertemplate=hover_template)
     
-    return fig
+    return _build_timeline(
+        _demand_frame(demands),
+        y="project_name",
+        color="status",
+        hover_cols=["role_required", "skills_required", "fte_required"],
+        hover_template=hover_template,
+        uid_prefix="demand",
+        legend_title="Status",
+        color_map=DEMAND_STATUS_COLORS,
+        width_col="fte_required"
+    )
 
 def create_allocation_gantt(allocations: List) -> go.Figure:
     """
@@ -188,69 +343,11 @@ def create_allocation_gantt(allocations: List) -> go.Figure:
         Plotly figure with the Gantt chart
     """
     # Handle empty input
-    if isinstance(allocations, pd.DataFrame):
-        if allocations.empty:
-            return go.Figure()
-        df = allocations
-    elif not allocations:
+    if isinstance(allocations, pd.DataFrame) and allocations.empty:
+        return go.Figure()
+    if not isinstance(allocations, pd.DataFrame) and not allocations:
         return go.Figure()
-    else:
-        # Convert list of objects to DataFrame
-        df = pd.DataFrame([{
-            "id": allocation.id,
-            "person_name": allocation.person_name,
-            "project_name": allocation.project_name,
-            "start_date": allocation.start_date,
-            "end_date": allocation.end_date,
-            "fte_allocated": allocation.fte_allocated,
-            "notes": allocation.notes if allocation.notes else ""
-        } for allocation in allocations])
-    
-    # Create figure
-    fig = px.timeline(
-        df, 
-        x_start="start_date", 
-        x_end="end_date", 
-        y="person_name",
-        color="project_name",
-        hover_data=["fte_allocated", "notes"]
-    )
-    
-    # Adjust bar width based on FTE (thicker bars for higher FTE)
-    for trace in fig.data:
-        widths = []
-        for i in range(len(df)):
-            # Normalize the width between 0.2 and 1.0 based on FTE
-            width = min(1.0, max(0.2, df.iloc[i]["fte_allocated"]))
-            widths.append(width)
-        
-        # Set the widths all at once
-        trace.update(width=widths)
-        
-        # Remove border
-        trace.marker.line.width = 0
-    
-    # Mark today's date with a vertical line
-    today = date.today()
-    fig.add_vline(x=today, line_width=2, line_dash="dash", line_color="red")
-    
-    # Customize layout
-    fig.update_layout(
-        xaxis_title="",
-        yaxis_title="",
-        legend_title="Project",
-        margin=dict(l=10, r=10, t=10, b=10),
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
     
-    # Improve hover information
     hover_template = (
         "<b>%{y}</b><br>" +
         "Project: <b>%{customdata[3]}</b><br>" +
@@ -260,10 +357,26 @@ def create_allocation_gantt(allocations: List) -> go.Figure:
         "%{customdata[1]}<br>" +  # Notes (only shown if present)
         "<extra></extra>"
     )
-    fig.update_traces(hovertemplate=hover_template)
     
-    return fig
+    return _build_timeline(
+        _allocation_frame(allocations),
+        y="person_name",
+        color="project_name",
+        hover_cols=["fte_allocated", "notes"],
+        hover_template=hover_template,
+        uid_prefix="allocation",
+        legend_title="Project",
+        width_col="fte_allocated",
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
 
+@st.cache_data(ttl=300, show_spinner=False, max_entries=32)
 def create_heatmap(df: pd.DataFrame, x_col: str, y_col: str, value_col: str, title: str) -> go.Figure:
     """
     Create a heatmap for resource allocation or demand
@@ -278,21 +391,23 @@ def create_heatmap(df: pd.DataFrame, x_col: str, y_col: str, value_col: str, tit
     Returns:
         go.Figure: Plotly figure with heatmap
     """
-    # Pivot data for heatmap
-    pivot_df = df.pivot_table(
-        values=value_col,
-        index=y_col,
-        columns=x_col,
-        aggfunc='sum',
-        fill_value=0
-    )
+    # Sum values into a dense y-by-x matrix; sorted codes keep the axes
+    # in label order, and missing cells stay 0. Rows with a missing label
+    # (code -1) are skipped, as pivot_table did
+    x_codes, x_labels = pd.factorize(df[x_col], sort=True)
+    y_codes, y_labels = pd.factorize(df[y_col], sort=True)
+    values = df[value_col].fillna(0).to_numpy(dtype=np.float64)
+    labelled = (x_codes >= 0) & (y_codes >= 0)
+    
+    matrix = np.zeros((len(y_labels), len(x_labels)), dtype=np.float64)
+    np.add.at(matrix, (y_codes[labelled], x_codes[labelled]), values[labelled])
     
     # Create heatmap
     fig = px.imshow(
-        pivot_df,
+        matrix,
         labels=dict(x=x_col, y=y_col, color=value_col),
-        x=pivot_df.columns,
-        y=pivot_df.index,
+        x=list(x_labels),
+        y=list(y_labels),
         color_continuous_scale="Viridis",
         aspect="auto"
     )
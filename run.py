@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import os
 import sys
-import subprocess
+
+from streamlit.web import bootstrap
 
 # Add the current directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Run Streamlit
-subprocess.run(["streamlit", "run", "app/main.py"]) 
\ No newline at end of file
+# Run Streamlit in this interpreter rather than spawning the CLI
+main_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "main.py")
+bootstrap.run(main_script, False, [], {})
@@ -0,0 +1,32 @@
+import queue
+
+import pytest
+
+import app.database as database
+from app.database import queries
+from app.database.init_db import initialize_database
+
+def _reset_shared_state():
+    """Close the shared connection and drop every cache that outlives it."""
+    database.close_conn()
+    queries._invalidate_cached_reads()
+    queries._monthly_dirty_range = None
+
+@pytest.fixture
+def db_dir(tmp_path, monkeypatch):
+    """Run the test from an empty directory, so DB_PATH names a fresh file."""
+    monkeypatch.chdir(tmp_path)
+    
+    # Pooled reader cursors belong to the connection being replaced
+    monkeypatch.setattr(queries, "_read_pool", queue.Queue())
+    monkeypatch.setattr(queries, "_read_pool_created", 0)
+    
+    _reset_shared_state()
+    yield tmp_path
+    _reset_shared_state()
+
+@pytest.fixture
+def seeded_db(db_dir):
+    """A freshly initialized database with the sample data loaded."""
+    initialize_database()
+    return database.get_conn()
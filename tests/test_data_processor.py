@@ -0,0 +1,23 @@
+from datetime import date
+
+from app.database import queries
+from app.models.data_models import Demand
+from app.utils.data_processor import filter_by_date_sql, rolling_avg_sql
+
+def _save_future_demand():
+    queries.save_demand(Demand(project_id=1, role_required="Engineer", fte_required=2.0,
+                               start_date=date(2031, 1, 1), end_date=date(2031, 3, 31)))
+
+def test_filter_by_date_sql_includes_unflushed_writes(seeded_db):
+    _save_future_demand()
+    
+    df = filter_by_date_sql(seeded_db, "monthly_demand_allocation", date(2031, 1, 1), date(2031, 3, 31))
+    
+    assert df.sort("year_month")["demand_fte"].to_list() == [2.0, 2.0, 2.0]
+
+def test_rolling_avg_sql_includes_unflushed_writes(seeded_db):
+    _save_future_demand()
+    
+    df = rolling_avg_sql(seeded_db, "monthly_demand_allocation", "demand_fte")
+    
+    assert df["demand_fte_rolling_avg"][-1] == 2.0
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+import polars as pl
+
+from app.database import queries
+from app.models.data_models import Demand
+from app.utils.fte_calculator import (
+    calculate_monthly_fte_distribution_df,
+    calculate_months_in_period,
+    fte_summary_sql,
+    monthly_distribution_all,
+    months_in_period_expr
+)
+
+def test_fte_summary_sql_includes_unflushed_writes(seeded_db):
+    queries.save_demand(Demand(project_id=1, role_required="Engineer", fte_required=2.0,
+                               start_date=date(2031, 1, 1), end_date=date(2031, 3, 31)))
+    
+    summary = fte_summary_sql(seeded_db, date(2031, 1, 1), date(2031, 3, 31))
+    
+    assert summary["total_demand"] == 6.0
+    assert summary["total_allocated"] == 0.0
+
+def test_monthly_distribution_all_matches_polars_distribution(seeded_db):
+    start_date, end_date = seeded_db.execute(
+        "SELECT MIN(start_date), MAX(end_date) FROM allocations"
+    ).fetchone()
+    
+    result = monthly_distribution_all(seeded_db, start_date, end_date)
+    
+    allocations = seeded_db.execute("""
+        SELECT id AS allocation_id, fte_allocated, start_date, end_date FROM allocations
+    """).pl()
+    expected = (
+        calculate_monthly_fte_distribution_df(allocations)
+        .select("allocation_id", "month_start", "month_fte")
+        .sort("allocation_id", "month_start")
+    )
+    
+    assert len(result) == len(expected) > 0
+    assert result["allocation_id"].to_list() == expected["allocation_id"].to_list()
+    assert result["month_start"].to_list() == expected["month_start"].to_list()
+    # fte_allocated is a FLOAT column, so allow for single precision
+    assert (result["month_fte"] - expected["month_fte"]).abs().max() < 1e-6
+
+def test_months_in_period_expr_matches_calculate_months_in_period():
+    starts = [date(2024, 1, 1), date(2024, 1, 15), date(2024, 2, 10), date(2024, 12, 31), date(2025, 3, 31)]
+    periods = [
+        (start, start + timedelta(days=days))
+        for start in starts
+        for days in (-1, 0, 1, 13, 27, 45, 364, 800)
+    ]
+    df = pl.DataFrame({
+        "start_date": [start for start, _ in periods],
+        "end_date": [end for _, end in periods]
+    })
+    
+    months = df.select(months_in_period_expr().alias("months"))["months"].to_list()
+    
+    for (start, end), value in zip(periods, months):
+        assert abs(value - calculate_months_in_period(start, end)) < 1e-9, (start, end)
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from app.visualizations.gantt_chart import _merge_allocation_spans
+
+def _allocations(*rows):
+    return pd.DataFrame(rows, columns=["person_name", "project_name", "start_date", "end_date",
+                                       "fte_allocated", "notes"])
+
+def _spans(df):
+    merged = _merge_allocation_spans(df).sort_values(["person_name", "start_date", "fte_allocated"])
+    return [
+        (row.person_name, row.start_date.strftime("%Y-%m-%d"), row.end_date.strftime("%Y-%m-%d"),
+         row.fte_allocated, row.notes)
+        for row in merged.itertuples()
+    ]
+
+def test_back_to_back_allocations_at_same_fte_are_merged():
+    df = _allocations(
+        ("Ada", "Website", "2025-02-01", "2025-02-28", 0.5, "Phase 2"),
+        ("Ada", "Website", "2025-01-01", "2025-01-31", 0.5, "Phase 1"),
+        ("Ada", "Website", "2025-03-01", "2025-03-31", 0.5, None),
+    )
+    
+    assert _spans(df) == [("Ada", "2025-01-01", "2025-03-31", 0.5, "Phase 1; Phase 2")]
+
+def test_gaps_fte_changes_and_overlaps_keep_separate_bars():
+    df = _allocations(
+        # A day's gap between the two
+        ("Ada", "Website", "2025-01-01", "2025-01-30", 0.5, ""),
+        ("Ada", "Website", "2025-02-01", "2025-02-28", 0.5, ""),
+        # Back to back, but at a different FTE
+        ("Bob", "Website", "2025-01-01", "2025-01-31", 0.5, ""),
+        ("Bob", "Website", "2025-02-01", "2025-02-28", 1.0, ""),
+        # Overlapping, where one bar couldn't show the summed load
+        ("Cy", "Website", "2025-01-01", "2025-03-31", 0.5, ""),
+        ("Cy", "Website", "2025-02-01", "2025-02-28", 0.5, ""),
+    )
+    
+    assert _spans(df) == [
+        ("Ada", "2025-01-01", "2025-01-30", 0.5, ""),
+        ("Ada", "2025-02-01", "2025-02-28", 0.5, ""),
+        ("Bob", "2025-01-01", "2025-01-31", 0.5, ""),
+        ("Bob", "2025-02-01", "2025-02-28", 1.0, ""),
+        ("Cy", "2025-01-01", "2025-03-31", 0.5, ""),
+        ("Cy", "2025-02-01", "2025-02-28", 0.5, ""),
+    ]
+
+def test_other_people_and_projects_are_not_merged():
+    df = _allocations(
+        ("Ada", "Website", "2025-01-01", "2025-01-31", 0.5, ""),
+        ("Ada", "Mobile", "2025-02-01", "2025-02-28", 0.5, ""),
+        ("Bob", "Website", "2025-02-01", "2025-02-28", 0.5, ""),
+    )
+    
+    assert len(_merge_allocation_spans(df)) == 3
@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+
+from app.database import queries
+from app.database.init_db import compute_monthly_allocations
+from app.models.data_models import Allocation, Demand, Person
+
+def _monthly_rows(conn):
+    return conn.execute("""
+        SELECT year_month, round(demand_fte, 6), round(allocation_fte, 6), capacity_fte
+        FROM monthly_demand_allocation
+        ORDER BY year_month
+    """).fetchall()
+
+@pytest.fixture
+def written_db(seeded_db):
+    """The sample database after writes that each mark a range of months dirty."""
+    demand_id = queries.save_demand(Demand(
+        project_id=1, role_required="Engineer", fte_required=1.5,
+        start_date=date(2024, 11, 10), end_date=date(2025, 2, 20)
+    ))
+    allocation_id = queries.save_allocation(Allocation(
+        person_id=1, project_id=1, demand_id=demand_id, fte_allocated=0.5,
+        start_date=date(2024, 12, 1), end_date=date(2025, 1, 31)
+    ))
+    
+    # Moving a demand marks both its old and new months
+    queries.save_demand(Demand(
+        project_id=1, role_required="Engineer", fte_required=1.5,
+        start_date=date(2025, 3, 1), end_date=date(2025, 3, 31), id=demand_id
+    ))
+    queries.delete_allocation(allocation_id)
+    queries.delete_allocation(queries.get_allocations()[0].id)
+    
+    # A new person changes the capacity of every month, not just the dirty ones
+    queries.save_person(Person(name="Ada Lovelace", role="Engineer", skills=[], team_id=1))
+    return seeded_db
+
+def test_ranged_refresh_matches_full_recompute(written_db):
+    queries.flush_monthly_allocations()
+    ranged = _monthly_rows(written_db)
+    
+    compute_monthly_allocations(written_db)
+    
+    assert ranged == _monthly_rows(written_db)
+
+def test_reading_monthly_data_flushes_dirty_months(written_db):
+    months = queries.get_monthly_demand_allocation(date(2024, 1, 1), date(2026, 12, 31))
+    assert queries._monthly_dirty_range is None
+    
+    compute_monthly_allocations(written_db)
+    
+    expected = [row for row in _monthly_rows(written_db)
+                if date(2024, 1, 1) <= row[0] <= date(2026, 12, 31)]
+    assert [month.year_month for month in months] == [row[0] for row in expected]
+
+def test_refreshed_at_flushes_dirty_months_first(written_db):
+    before = queries._write_generation
+    
+    refreshed_at = queries.get_monthly_refreshed_at()
+    
+    assert refreshed_at is not None
+    assert queries._monthly_dirty_range is None
+    assert queries._write_generation > before
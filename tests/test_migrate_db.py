@@ -0,0 +1,138 @@
+import duckdb
+import pytest
+
+from app.database import get_conn
+from app.database.migrate_db import migrate_database, needs_rebuild
+from app.database.queries import get_demands, get_people, get_allocations
+
+# Schema written by the original release, without id sequence defaults
+BASELINE_SCHEMA = """
+CREATE TABLE teams (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    description VARCHAR
+);
+CREATE TABLE people (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    role VARCHAR,
+    skills VARCHAR,
+    team_id INTEGER,
+    FOREIGN KEY (team_id) REFERENCES teams(id)
+);
+CREATE TABLE projects (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    description VARCHAR,
+    start_date DATE NOT NULL,
+    end_date DATE,
+    status VARCHAR DEFAULT 'planning'
+);
+CREATE TABLE demands (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    role_required VARCHAR,
+    skills_required VARCHAR,
+    fte_required FLOAT NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    priority INTEGER DEFAULT 1,
+    status VARCHAR DEFAULT 'open',
+    FOREIGN KEY (project_id) REFERENCES projects(id)
+);
+CREATE TABLE allocations (
+    id INTEGER PRIMARY KEY,
+    person_id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    demand_id INTEGER,
+    fte_allocated FLOAT NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    notes VARCHAR,
+    FOREIGN KEY (person_id) REFERENCES people(id),
+    FOREIGN KEY (project_id) REFERENCES projects(id),
+    FOREIGN KEY (demand_id) REFERENCES demands(id)
+);
+CREATE TABLE monthly_demand_allocation (
+    year_month DATE NOT NULL,
+    demand_fte FLOAT DEFAULT 0,
+    allocation_fte FLOAT DEFAULT 0,
+    capacity_fte FLOAT DEFAULT 0,
+    PRIMARY KEY (year_month)
+);
+"""
+
+BASELINE_ROWS = """
+INSERT INTO teams VALUES (1, 'Engineering', 'Software development team');
+INSERT INTO people VALUES
+    (1, 'John Smith', 'Software Engineer', 'Python,JavaScript', 1),
+    (2, 'Jane Doe', 'Senior Developer', 'Java,Docker', 1),
+    (3, 'Grace Lee', 'UI Designer', '', NULL);
+INSERT INTO projects VALUES (1, 'Website', 'Redesign', DATE '2025-01-01', DATE '2025-06-30', 'active');
+INSERT INTO demands VALUES
+    (1, 1, 'Developer', 'Python,SQL', 1.0, DATE '2025-01-01', DATE '2025-03-31', 3, 'partially_filled'),
+    (2, 1, 'Designer', NULL, 0.5, DATE '2025-02-01', DATE '2025-04-30', 1, 'open');
+INSERT INTO allocations VALUES
+    (1, 1, 1, 1, 0.5, DATE '2025-01-01', DATE '2025-03-31', 'Half time');
+"""
+
+def _create_baseline_db():
+    conn = get_conn()
+    conn.execute(BASELINE_SCHEMA)
+    conn.execute(BASELINE_ROWS)
+    return conn
+
+def test_migrate_rebuilds_baseline_db(db_dir):
+    conn = _create_baseline_db()
+    assert needs_rebuild(conn)
+    
+    migrate_database()
+    
+    assert not needs_rebuild(conn)
+    
+    people = {person.id: person for person in get_people()}
+    assert people[1].skills == ["Python", "JavaScript"]
+    assert people[3].skills == []
+    
+    demands = {demand.id: demand for demand in get_demands()}
+    assert demands[1].skills_required == ["Python", "SQL"]
+    assert demands[2].skills_required == []
+    assert [demand.id for demand in get_demands(skill="SQL")] == [1]
+
+def test_migrate_keeps_rows_and_foreign_keys(db_dir):
+    conn = _create_baseline_db()
+    
+    migrate_database()
+    
+    allocations = get_allocations()
+    assert len(allocations) == 1
+    assert allocations[0].person_name == "John Smith"
+    assert allocations[0].demand_id == 1
+    
+    # The recreated foreign keys still reject dangling references
+    with pytest.raises(duckdb.ConstraintException, match="foreign key"):
+        conn.execute("""
+            INSERT INTO allocations (id, person_id, project_id, fte_allocated, start_date, end_date)
+            VALUES (2, 99, 1, 0.5, DATE '2025-01-01', DATE '2025-01-31')
+        """)
+    
+    # New rows continue numbering after the copied ids
+    new_id = conn.execute("""
+        INSERT INTO allocations (person_id, project_id, fte_allocated, start_date, end_date)
+        VALUES (2, 1, 0.5, DATE '2025-01-01', DATE '2025-01-31')
+        RETURNING id
+    """).fetchone()[0]
+    assert new_id == 2
+    
+    # The monthly rollup is rebuilt from the copied rows
+    months = conn.execute("SELECT COUNT(*) FROM monthly_demand_allocation").fetchone()[0]
+    assert months == 4
+
+def test_migrate_is_idempotent(db_dir, capsys):
+    _create_baseline_db()
+    migrate_database()
+    capsys.readouterr()
+    
+    migrate_database()
+    
+    assert "already up to date" in capsys.readouterr().out
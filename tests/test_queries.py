@@ -0,0 +1,107 @@
+import dataclasses
+from datetime import date
+
+from app.database import queries
+from app.models.data_models import Allocation, Demand, Person
+
+def _max_id(conn, table):
+    return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+
+def test_bulk_inserts_assign_ids_after_seed_data(seeded_db):
+    max_person_id = _max_id(seeded_db, "people")
+    
+    person_ids = queries.save_people_bulk([
+        Person(name="Ada Lovelace", role="Engineer", skills=["Python"], team_id=1),
+        Person(name="Alan Turing", role="Scientist", skills=[], team_id=None),
+    ])
+    
+    assert person_ids == [max_person_id + 1, max_person_id + 2]
+    assert queries.get_person(person_ids[0]).skills == ["Python"]
+    
+    demand_ids = queries.save_demands_bulk([
+        Demand(project_id=1, role_required="Engineer", fte_required=1.0,
+               start_date=date(2025, 1, 1), end_date=date(2025, 3, 31), skills_required=["Python"]),
+    ])
+    assert demand_ids == [_max_id(seeded_db, "demands")]
+    
+    allocation_ids = queries.save_allocations_bulk([
+        Allocation(person_id=person_ids[0], project_id=1, demand_id=demand_ids[0], fte_allocated=0.5,
+                   start_date=date(2025, 1, 1), end_date=date(2025, 3, 31)),
+    ])
+    assert allocation_ids == [_max_id(seeded_db, "allocations")]
+    assert queries.get_allocation(allocation_ids[0]).person_name == "Ada Lovelace"
+
+def test_skills_of_allocated_rows_can_be_updated(seeded_db):
+    allocation = queries.get_allocations()[0]
+    
+    person = queries.get_person(allocation.person_id)
+    person = dataclasses.replace(person, skills=person.skills + ["Rust"])
+    queries.save_person(person)
+    assert queries.get_person(person.id).skills == person.skills
+    assert person.id in [p.id for p in queries.get_people(skill="Rust")]
+    
+    demand = dataclasses.replace(queries.get_demand(allocation.demand_id), skills_required=[])
+    queries.save_demand(demand)
+    assert queries.get_demand(demand.id).skills_required == []
+
+def _new_demand(**changes):
+    demand = Demand(project_id=1, role_required="Engineer", fte_required=1.0,
+                    start_date=date(2025, 1, 15), end_date=date(2025, 4, 30),
+                    skills_required=["Python", "SQL"])
+    return dataclasses.replace(demand, **changes)
+
+def test_demand_save_update_and_delete(seeded_db):
+    demand_id = queries.save_demand(_new_demand())
+    
+    saved = queries.get_demand(demand_id)
+    assert saved.skills_required == ["Python", "SQL"]
+    assert saved.status == "open"
+    
+    queries.save_demand(dataclasses.replace(saved, fte_required=2.0, end_date=date(2025, 6, 30)))
+    updated = queries.get_demand(demand_id)
+    assert updated.fte_required == 2.0
+    assert updated.end_date == date(2025, 6, 30)
+    assert demand_id in [demand.id for demand in queries.get_demands(project_id=1)]
+    
+    assert queries.delete_demand(demand_id)
+    assert queries.get_demand(demand_id) is None
+
+def test_demand_with_allocations_is_not_deleted(seeded_db):
+    allocation = queries.get_allocations()[0]
+    
+    assert not queries.delete_demand(allocation.demand_id)
+    assert queries.get_demand(allocation.demand_id) is not None
+
+def test_allocation_save_update_and_delete_refresh_demand_status(seeded_db):
+    demand_id = queries.save_demand(_new_demand())
+    allocation = Allocation(person_id=1, project_id=1, demand_id=demand_id, fte_allocated=0.5,
+                            start_date=date(2025, 1, 15), end_date=date(2025, 4, 30), notes="Half time")
+    
+    allocation_id = queries.save_allocation(allocation)
+    saved = queries.get_allocation(allocation_id)
+    assert saved.fte_allocated == 0.5
+    assert saved.notes == "Half time"
+    assert queries.get_demand(demand_id).status == "partially_filled"
+    
+    queries.save_allocation(dataclasses.replace(saved, fte_allocated=1.0))
+    assert queries.get_allocation(allocation_id).fte_allocated == 1.0
+    assert queries.get_demand(demand_id).status == "filled"
+    
+    # The demand stays editable while allocations reference it
+    queries.save_demand(dataclasses.replace(queries.get_demand(demand_id), end_date=date(2025, 5, 31)))
+    assert queries.get_demand(demand_id).end_date == date(2025, 5, 31)
+    
+    assert queries.delete_allocation(allocation_id)
+    assert queries.get_allocation(allocation_id) is None
+    assert queries.get_demand(demand_id).status == "open"
+
+def test_cached_reads_share_results_until_a_write(seeded_db):
+    person = queries.get_person(1)
+    demands = queries.get_demands()
+    assert queries.get_person(1) is person
+    assert queries.get_demands() is demands
+    
+    queries.save_person(dataclasses.replace(person, name="Renamed"))
+    
+    assert queries.get_person(1).name == "Renamed"
+    assert queries.get_demands() is not demands